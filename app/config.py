@@ -1,72 +1,104 @@
 import os
-from typing import List
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Any, FrozenSet, Optional, Tuple, Union
+from pydantic import field_validator, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv()
+# Deployments that inject env vars directly set ZENTAR_LOAD_DOTENV=0 to skip
+# reading .env on every process start
+LOAD_DOTENV: bool = os.environ.get("ZENTAR_LOAD_DOTENV", "1") == "1"
 
-class Settings:
-    # Database Configuration
-    MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-    DATABASE_NAME: str = os.getenv("DATABASE_NAME", "zentar_email")
-    
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env" if LOAD_DOTENV else None,
+        extra="ignore",
+        frozen=True
+    )
 
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    EMAIL_SERVER = os.getenv("EMAIL_SERVER")
-    EMAIL_USERNAME = os.getenv("EMAIL_USERNAME")
-    EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
-    EMAIL_PORT = os.getenv("EMAIL_PORT")
+    # Database Configuration
+    MONGODB_URL: str = "mongodb://localhost:27017"
+    DATABASE_NAME: str = "zentar_email"
 
+    EMAIL_SERVER: Optional[str] = None
+    EMAIL_USERNAME: Optional[str] = None
+    EMAIL_PASSWORD: Optional[str] = None
+    EMAIL_PORT: Optional[int] = None
 
     # IMAP configuration
-    IMAP_USERNAME = os.getenv("IMAP_USERNAME", EMAIL_USERNAME)  # defaults to EMAIL_USERNAME if not set
-    IMAP_PASSWORD = os.getenv("IMAP_PASSWORD", EMAIL_PASSWORD)
-    IMAP_SERVER = os.getenv("IMAP_SERVER", "imap.gmail.com")
-    IMAP_PORT = os.getenv("IMAP_PORT", 993)
+    IMAP_USERNAME: Optional[str] = None  # defaults to EMAIL_USERNAME if not set
+    IMAP_PASSWORD: Optional[str] = None  # defaults to EMAIL_PASSWORD if not set
+    IMAP_SERVER: str = "imap.gmail.com"
+    IMAP_PORT: int = 993
 
     # SMTP configuration for sending emails
-    SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-    SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
-    SMTP_USERNAME = os.getenv("SMTP_USERNAME", EMAIL_USERNAME)  # defaults to EMAIL_USERNAME if not set
-    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", EMAIL_PASSWORD)  # defaults to EMAIL_PASSWORD if not set
-    SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "True").lower() == "true"
+    SMTP_SERVER: str = "smtp.gmail.com"
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: Optional[str] = None  # defaults to EMAIL_USERNAME if not set
+    SMTP_PASSWORD: Optional[str] = None  # defaults to EMAIL_PASSWORD if not set
+    SMTP_USE_TLS: bool = True
 
     # JWT Configuration
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here-make-it-long-and-secure")
-    ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
-    
+    SECRET_KEY: str = "your-secret-key-here-make-it-long-and-secure"
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+
     # Server Configuration
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", "8000"))
-    DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
-    
-    # CORS Configuration
-    ALLOWED_ORIGINS: List[str] = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
-    
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    DEBUG: bool = True
+
+    # CORS Configuration (comma-separated string or JSON list)
+    ALLOWED_ORIGINS: Union[FrozenSet[str], str] = frozenset({"http://localhost:3000", "http://localhost:5173"})
+    ALLOWED_ORIGIN_REGEX: Optional[str] = r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$"
+
     # Google Calendar API Configuration
-    GOOGLE_CALENDAR_CREDENTIALS_FILE: str = os.getenv("GOOGLE_CALENDAR_CREDENTIALS_FILE", "credentials.json")
-    GOOGLE_CALENDAR_TOKEN_FILE: str = os.getenv("GOOGLE_CALENDAR_TOKEN_FILE", "token.pickle")
-    
+    GOOGLE_CALENDAR_CREDENTIALS_FILE: str = "credentials.json"
+    GOOGLE_CALENDAR_TOKEN_FILE: str = "token.json"
+
     # Gemini AI Configuration
-    GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
-    
+    GEMINI_API_KEY: str = ""
+
     # Default Settings
-    DEFAULT_TIMEZONE: str = os.getenv("DEFAULT_TIMEZONE", "Asia/Kolkata")
-    
+    DEFAULT_TIMEZONE: str = "Asia/Kolkata"
+
     # Working Hours (24-hour format)
-    DEFAULT_WORKING_HOURS: tuple = (9, 17)  # 9 AM to 5 PM
-    
+    DEFAULT_WORKING_HOURS: Tuple[int, int] = (9, 17)  # 9 AM to 5 PM
+
     # Meeting Settings
-    DEFAULT_MEETING_DURATION: int = int(os.getenv("DEFAULT_MEETING_DURATION", "60"))  # minutes
-    BUFFER_TIME_BETWEEN_MEETINGS: int = int(os.getenv("BUFFER_TIME_BETWEEN_MEETINGS", "15"))  # minutes
-    
+    DEFAULT_MEETING_DURATION: int = 60  # minutes
+    BUFFER_TIME_BETWEEN_MEETINGS: int = 15  # minutes
+
     # AI Assistant Settings
-    AI_TEMPERATURE: float = float(os.getenv("AI_TEMPERATURE", "0.1"))
-    MAX_ALTERNATIVES_SUGGESTED: int = int(os.getenv("MAX_ALTERNATIVES_SUGGESTED", "3"))
-    ENABLE_CONFLICT_DETECTION: bool = os.getenv("ENABLE_CONFLICT_DETECTION", "True").lower() == "true"
-    ENABLE_SMART_SCHEDULING: bool = os.getenv("ENABLE_SMART_SCHEDULING", "True").lower() == "true"
-    
+    AI_TEMPERATURE: float = 0.1
+    MAX_ALTERNATIVES_SUGGESTED: int = 3
+    ENABLE_CONFLICT_DETECTION: bool = True
+    ENABLE_SMART_SCHEDULING: bool = True
+
     # Notification Settings
-    DEFAULT_REMINDER_MINUTES: List[int] = [15, 60]  # 15 minutes and 1 hour before
+    DEFAULT_REMINDER_MINUTES: Tuple[int, ...] = (15, 60)  # 15 minutes and 1 hour before
+
+    @field_validator("ALLOWED_ORIGINS", mode="before")
+    @classmethod
+    def _split_origins(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = value.split(",")
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return frozenset(origin.strip() for origin in value if origin.strip())
+        return value
+
+    @model_validator(mode="before")
+    @classmethod
+    def _default_mail_credentials(cls, data: Any) -> Any:
+        """IMAP/SMTP credentials fall back to the shared EMAIL_* values"""
+        if isinstance(data, dict):
+            for prefix in ("IMAP", "SMTP"):
+                data.setdefault(f"{prefix}_USERNAME", data.get("EMAIL_USERNAME"))
+                data.setdefault(f"{prefix}_PASSWORD", data.get("EMAIL_PASSWORD"))
+        return data
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance"""
+    return Settings()
 
-settings = Settings()
+settings = get_settings()
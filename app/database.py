@@ -1,5 +1,9 @@
+import logging
+from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
 from app.config import settings
 from app.models.user import User
 from app.models.email import Email
@@ -7,12 +11,23 @@ from app.models.thread import Thread
 from app.models.reminder import Reminder
 from app.models.meeting import Meeting
 
+# Beanie document models registered at startup
+_DOCUMENT_MODELS = (User, Email, Thread, Reminder, Meeting)
+
+_client: Optional[AsyncIOMotorClient] = None
+
+def get_client() -> AsyncIOMotorClient:
+    """Get the shared MongoDB client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(settings.MONGODB_URL, maxPoolSize=100)
+    return _client
+
 async def init_db():
     """Initialize database connection and Beanie models"""
-    import logging
     try:
-        logging.info(f"Connecting to MongoDB at {settings.MONGODB_URL}")
-        client = AsyncIOMotorClient(settings.MONGODB_URL)
+        logging.info("Connecting to MongoDB at %s", settings.MONGODB_URL)
+        client = get_client()
         
         # Test connection
         await client.admin.command('ping')
@@ -21,20 +36,60 @@ async def init_db():
         # Initialize Beanie with the document models
         await init_beanie(
             database=client[settings.DATABASE_NAME],
-            document_models=[
-                User,
-                Email,
-                Thread,
-                Reminder,
-                Meeting
-            ]
+            document_models=_DOCUMENT_MODELS
         )
         logging.info("Beanie models initialized successfully")
+        
+        await _backfill_thread_participant_keys()
     except Exception as e:
-        logging.error(f"Database initialization failed: {str(e)}")
+        logging.error("Database initialization failed: %s", e)
         raise
 
+async def _backfill_thread_participant_keys():
+    """Key threads created before participantsKey existed (no-op once all are done)"""
+    # send_email matches on participantsKey alone; when several legacy threads
+    # share a participant set, the most recently updated one keeps receiving
+    # mail. The others get participantsKey: null, which the partial unique
+    # index ignores, so later startups don't rescan them
+    collection = Thread.get_motor_collection()
+    cursor = collection.find(
+        {"participantsKey": {"$exists": False}},
+        projection={"participants": 1}
+    ).sort("lastUpdated", DESCENDING)
+    
+    seen = set()
+    keyed_ids = []
+    updates = []
+    duplicates = []
+    async for doc in cursor:
+        key = Thread.participants_key(doc.get("participants", []))
+        if key in seen:
+            duplicates.append(doc["_id"])
+            continue
+        seen.add(key)
+        keyed_ids.append(doc["_id"])
+        updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"participantsKey": key}}))
+    
+    if updates:
+        try:
+            result = await collection.bulk_write(updates, ordered=False)
+            logging.info("Backfilled participantsKey on %s threads", result.modified_count)
+        except BulkWriteError as e:
+            # Duplicate key: a keyed thread already owns that participant set
+            errors = e.details.get("writeErrors", [])
+            duplicates.extend(keyed_ids[error["index"]] for error in errors if error.get("code") == 11000)
+            logging.info(
+                "Backfilled participantsKey on %s threads; %s already had a keyed thread",
+                e.details.get("nModified", 0), len(errors)
+            )
+    
+    if duplicates:
+        await collection.update_many({"_id": {"$in": duplicates}}, {"$set": {"participantsKey": None}})
+        logging.info("Marked %s duplicate legacy threads as unkeyed", len(duplicates))
+
 async def close_db():
     """Close database connection"""
-    # Motor client will be closed automatically when the app shuts down
-    pass
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
@@ -1,49 +1,93 @@
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.cors import CORSMiddleware as StarletteCORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from typing import Any
+import orjson
+from bson import ObjectId
 from app.config import settings
 from app.database import init_db, close_db
-from app.routers import auth, emails, reminders, meetings, meeting_ai, settings as settings_router
+from app.services.email_service import close_imap_connection
+from app.routers import auth, debug, emails, reminders, meetings, meeting_ai, settings as settings_router
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging with one formatter built at import time
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("{asctime} - {name} - {levelname} - {message}", style="{"))
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Blocking Google Calendar / Gemini calls run via asyncio.to_thread;
+    # give them a pool sized for concurrent requests
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=32))
     await init_db()
     yield
     # Shutdown
+    await asyncio.to_thread(close_imap_connection)
     await close_db()
 
+class CORSMiddleware(StarletteCORSMiddleware):
+    """CORSMiddleware with O(1) lookup of the explicitly allowed origins"""
+
+    def __init__(self, app, allow_origins=(), **kwargs):
+        super().__init__(app, allow_origins=allow_origins, **kwargs)
+        self.allow_origins = frozenset(allow_origins)
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        # Exact matches are the common case, so check them before the regex
+        if self.allow_all_origins or origin in self.allow_origins:
+            return True
+        return self.allow_origin_regex is not None and self.allow_origin_regex.fullmatch(origin) is not None
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError
+
+class AppJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also serializes ObjectId values"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
 app = FastAPI(
     title="Zentar Email Backend API",
     description="A FastAPI backend for email management with reminders and meetings",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=AppJSONResponse
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins
+    allow_origins=settings.ALLOWED_ORIGINS,
+    allow_origin_regex=settings.ALLOWED_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 # Include routers
-app.include_router(auth.router, prefix="/api/v1")
-app.include_router(emails.router, prefix="/api/v1")
-app.include_router(reminders.router, prefix="/api/v1")
-app.include_router(meetings.router, prefix="/api/v1")
-app.include_router(meeting_ai.router, prefix="/api/v1")
-app.include_router(settings_router.router, prefix="/api/v1")
+API_PREFIX = "/api/v1"
+ROUTERS = (
+    auth.router,
+    emails.router,
+    reminders.router,
+    meetings.router,
+    meeting_ai.router,
+    settings_router.router,
+)
+for router in ROUTERS:
+    app.include_router(router, prefix=API_PREFIX)
+
+# Debug endpoints are only exposed in development
+if settings.DEBUG:
+    app.include_router(debug.router)
 
 @app.get("/")
 async def root():
@@ -60,65 +104,22 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "API is running"}
 
-@app.get("/debug/db")
-async def debug_database():
-    """Debug endpoint to test database connection"""
-    try:
-        from app.database import init_db
-        from app.models.user import User
-        import logging
-        
-        logging.info("Testing database connection...")
-        
-        # Test if we can connect to MongoDB
-        from motor.motor_asyncio import AsyncIOMotorClient
-        from app.config import settings
-        
-        client = AsyncIOMotorClient(settings.MONGODB_URL)
-        await client.admin.command('ping')
-        
-        # Test if we can query users
-        user_count = await User.count_documents({})
-        
-        return {
-            "status": "success",
-            "mongodb_connection": "OK",
-            "database_name": settings.DATABASE_NAME,
-            "user_count": user_count,
-            "message": "Database connection and query successful"
-        }
-    except Exception as e:
-        import logging
-        logging.error(f"Database debug failed: {str(e)}")
-        return {
-            "status": "error",
-            "error": str(e),
-            "error_type": type(e).__name__,
-            "message": "Database connection or query failed"
-        }
-
-@app.get("/debug/test")
-async def debug_test():
-    """Simple test endpoint without authentication"""
-    return {
-        "status": "success",
-        "message": "Basic endpoint working",
-        "timestamp": "2024-01-01T00:00:00Z"
-    }
-
 # Global exception handler
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return AppJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail}
     )
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools"
     )
@@ -1,44 +1,45 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from datetime import datetime, timezone
-from typing import List, Optional
-from pydantic import Field
-from bson import ObjectId
+from functools import partial
+from typing import Any, Dict, List, Optional
+from beanie.odm.queries.find import FindMany
+from pydantic import BaseModel, ConfigDict, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+_utcnow = partial(datetime.now, timezone.utc)
+
+class EmailPreview(BaseModel):
+    """Email projection for list views, without body or attachments"""
+    id: PydanticObjectId = Field(alias="_id")
+    from_user: PydanticObjectId = Field(alias="from")
+    subject: str
+    threadId: PydanticObjectId
+    isRead: bool = False
+    sentAt: datetime
+
+    model_config = ConfigDict(frozen=True)
 
 class Email(Document):
-    from_user: ObjectId = Field(alias="from")
-    to_users: List[ObjectId] = Field(alias="to")
+    from_user: PydanticObjectId = Field(alias="from")
+    to_users: List[PydanticObjectId] = Field(alias="to")
     subject: str
     body: str
-    threadId: ObjectId
+    threadId: PydanticObjectId
     isRead: bool = False
     isDeleted: bool = False
-    sentAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    sentAt: datetime = Field(default_factory=_utcnow)
     attachments: List[str] = Field(default_factory=list)
 
     class Settings:
         name = "emails"
+        # Compound indexes matching the inbox and thread queries. Aliased
+        # fields are stored under their alias ("to"), so index that key.
         indexes = [
-            "from_user",
-            "to_users",
-            "threadId",
-            "sentAt",
-            "isRead",
-            "isDeleted"
+            IndexModel([("to", ASCENDING), ("isDeleted", ASCENDING), ("sentAt", DESCENDING)]),
+            IndexModel([("threadId", ASCENDING), ("sentAt", ASCENDING)])
         ]
 
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "json_schema_extra": {
-            "example": {
-                "from": "507f1f77bcf86cd799439011",
-                "to": ["507f1f77bcf86cd799439012"],
-                "subject": "Meeting Tomorrow",
-                "body": "Hi, let's meet tomorrow at 2 PM.",
-                "threadId": "507f1f77bcf86cd799439013",
-                "isRead": False,
-                "isDeleted": False,
-                "sentAt": "2024-01-01T00:00:00Z",
-                "attachments": []
-            }
-        }
-    }
+    @classmethod
+    def list_preview(cls, filters: Dict[str, Any]) -> FindMany[EmailPreview]:
+        """Find emails matching filters, fetching only the EmailPreview fields"""
+        return cls.find(filters).project(EmailPreview)
@@ -1,12 +1,24 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from datetime import datetime
-from typing import List
-from pydantic import Field
-from bson import ObjectId
+from typing import Any, Dict, List
+from beanie.odm.queries.find import FindMany
+from pydantic import BaseModel, ConfigDict, Field
+from pymongo import ASCENDING, IndexModel
+
+class MeetingPreview(BaseModel):
+    """Meeting projection for list views, without description or participants"""
+    id: PydanticObjectId = Field(alias="_id")
+    organizerId: PydanticObjectId
+    title: str
+    startTime: datetime
+    endTime: datetime
+    status: str
+
+    model_config = ConfigDict(frozen=True)
 
 class Meeting(Document):
-    organizerId: ObjectId
-    participants: List[ObjectId]
+    organizerId: PydanticObjectId
+    participants: List[PydanticObjectId]
     title: str
     description: str
     startTime: datetime
@@ -16,23 +28,11 @@ class Meeting(Document):
     class Settings:
         name = "meetings"
         indexes = [
-            "organizerId",
-            "participants",
-            "startTime",
-            "status"
+            IndexModel([("participants", ASCENDING), ("startTime", ASCENDING)]),
+            IndexModel([("organizerId", ASCENDING), ("status", ASCENDING), ("startTime", ASCENDING)])
         ]
 
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "json_schema_extra": {
-            "example": {
-                "organizerId": "507f1f77bcf86cd799439011",
-                "participants": ["507f1f77bcf86cd799439012", "507f1f77bcf86cd799439013"],
-                "title": "Project Review Meeting",
-                "description": "Weekly project review and planning session",
-                "startTime": "2024-01-02T14:00:00Z",
-                "endTime": "2024-01-02T15:00:00Z",
-                "status": "scheduled"
-            }
-        }
-    }
+    @classmethod
+    def list_preview(cls, filters: Dict[str, Any]) -> FindMany[MeetingPreview]:
+        """Find meetings matching filters, fetching only the MeetingPreview fields"""
+        return cls.find(filters).project(MeetingPreview)
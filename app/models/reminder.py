@@ -1,13 +1,15 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from datetime import datetime, timezone
+from functools import partial
 from pydantic import Field
-from bson import ObjectId
+
+_utcnow = partial(datetime.now, timezone.utc)
 
 class Reminder(Document):
-    userId: ObjectId
-    emailId: ObjectId
+    userId: PydanticObjectId
+    emailId: PydanticObjectId
     remindAt: datetime
-    createdAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    createdAt: datetime = Field(default_factory=_utcnow)
 
     class Settings:
         name = "reminders"
@@ -16,15 +18,3 @@ class Reminder(Document):
             "emailId",
             "remindAt"
         ]
-
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "json_schema_extra": {
-            "example": {
-                "userId": "507f1f77bcf86cd799439011",
-                "emailId": "507f1f77bcf86cd799439012",
-                "remindAt": "2024-01-02T00:00:00Z",
-                "createdAt": "2024-01-01T00:00:00Z"
-            }
-        }
-    }
@@ -1,28 +1,32 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from datetime import datetime, timezone
-from typing import List
+from functools import partial
+from typing import Iterable, List, Optional
 from pydantic import Field
-from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+_utcnow = partial(datetime.now, timezone.utc)
 
 class Thread(Document):
-    participants: List[ObjectId]
-    emails: List[ObjectId] = Field(default_factory=list)
-    lastUpdated: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    participants: List[PydanticObjectId]
+    emails: List[PydanticObjectId] = Field(default_factory=list)
+    lastUpdated: datetime = Field(default_factory=_utcnow)
+    # Sorted, de-duplicated participant ids; one thread per participant set
+    participantsKey: Optional[str] = None
 
     class Settings:
         name = "threads"
         indexes = [
-            "participants",
-            "lastUpdated"
+            IndexModel([("participants", ASCENDING), ("lastUpdated", DESCENDING)]),
+            # Partial so threads created before participantsKey existed don't collide
+            IndexModel(
+                [("participantsKey", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"participantsKey": {"$type": "string"}}
+            )
         ]
 
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "json_schema_extra": {
-            "example": {
-                "participants": ["507f1f77bcf86cd799439011", "507f1f77bcf86cd799439012"],
-                "emails": ["507f1f77bcf86cd799439013", "507f1f77bcf86cd799439014"],
-                "lastUpdated": "2024-01-01T00:00:00Z"
-            }
-        }
-    }
+    @staticmethod
+    def participants_key(participant_ids: Iterable[PydanticObjectId]) -> str:
+        """Order-independent key for a set of participants"""
+        return ",".join(sorted({str(pid) for pid in participant_ids}))
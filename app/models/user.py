@@ -1,7 +1,18 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from datetime import datetime, timezone
-from typing import Dict, Optional
-from pydantic import Field
+from functools import partial
+from typing import Dict, Iterable, Optional
+from beanie.odm.queries.find import FindMany
+from pydantic import BaseModel, ConfigDict, Field
+
+_utcnow = partial(datetime.now, timezone.utc)
+
+class UserRef(BaseModel):
+    """User projection carrying only what recipient lookups need"""
+    id: PydanticObjectId = Field(alias="_id")
+    email: str
+
+    model_config = ConfigDict(frozen=True)
 
 class User(Document):
     name: str
@@ -9,8 +20,8 @@ class User(Document):
     password: str
     avatar: Optional[str] = None
     settings: Dict = Field(default_factory=dict)
-    createdAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updatedAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    createdAt: datetime = Field(default_factory=_utcnow)
+    updatedAt: datetime = Field(default_factory=_utcnow)
 
     class Settings:
         name = "users"
@@ -18,17 +29,7 @@ class User(Document):
             "email",  # Unique index on email
         ]
 
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "json_schema_extra": {
-            "example": {
-                "name": "John Doe",
-                "email": "john@example.com",
-                "password": "hashed_password",
-                "avatar": "https://example.com/avatar.jpg",
-                "settings": {"theme": "dark"},
-                "createdAt": "2024-01-01T00:00:00Z",
-                "updatedAt": "2024-01-01T00:00:00Z"
-            }
-        }
-    }
+    @classmethod
+    def find_by_emails(cls, emails: Iterable[str]) -> FindMany[UserRef]:
+        """Find users with any of the given emails in one query, fetching only id and email"""
+        return cls.find({"email": {"$in": list(emails)}}).project(UserRef)
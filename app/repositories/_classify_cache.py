@@ -0,0 +1,53 @@
+import hashlib
+import re
+import threading
+from typing import Any, Dict, Optional, Protocol
+
+import orjson
+from cachetools import TTLCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+class CacheBackend(Protocol):
+    """Storage used by LLMCache; anything with get/set keyed by str works"""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]: ...
+
+    def set(self, key: str, value: Dict[str, Any]) -> None: ...
+
+class MemoryBackend:
+    """Process-local TTL store"""
+
+    def __init__(self, maxsize: int = 4096, ttl: int = 86400):
+        self._store: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._store.get(key)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._store[key] = value
+
+class LLMCache:
+    """Exact-match cache for classifier results keyed on normalized input"""
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend or MemoryBackend()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(subject: str, body: str) -> str:
+        subject = (subject or "").strip().lower()
+        body = _WHITESPACE.sub(" ", body or "").strip()
+        payload = orjson.dumps({"s": subject, "b": body}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(key)
+        self.stats["hits" if value is not None else "misses"] += 1
+        return dict(value) if value is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self.backend.set(key, dict(value))
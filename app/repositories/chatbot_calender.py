@@ -1,16 +1,30 @@
 import os
-import pickle
-import json
 import re
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional, Tuple, Any
-import pytz
-from dataclasses import dataclass, asdict
+import asyncio
+import copy
+import dataclasses
+import hashlib
+import logging
+import threading
+from datetime import datetime, time, timedelta, timezone
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dataclasses import dataclass, asdict, field
+from functools import lru_cache
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from cachetools import LRUCache, TTLCache
+import msgspec
+import orjson
 from pathlib import Path
 
 # Google Calendar API
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -20,12 +34,280 @@ import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from app.config import settings
 
+def _list_on(days_ahead: int):
+    def build(match: re.Match) -> Dict[str, Any]:
+        day = datetime.now() + timedelta(days=days_ahead)
+        return {"action": "list", "date": day.strftime('%Y-%m-%d')}
+    return build
+
+def _find_free_time(match: re.Match) -> Dict[str, Any]:
+    amount = int(match.group('amount')) if match.group('amount') else 1
+    unit = match.group('unit').lower()
+    return {"action": "find", "duration_minutes": amount * 60 if unit.startswith('h') else amount}
+
+# Commands simple enough to parse without a Gemini round-trip
+_FAST_COMMANDS = (
+    (re.compile(r'^(?:list|show)(?:\s+my)?\s+(?:events?|meetings?|schedule)(?:\s+for)?\s+today$', re.I), _list_on(0)),
+    (re.compile(r'^(?:list|show)(?:\s+my)?\s+(?:events?|meetings?|schedule)(?:\s+for)?\s+tomorrow$', re.I), _list_on(1)),
+    (re.compile(r'^find\s+free\s+(?:time|slots?)(?:\s+for)?(?:\s+(?:(?P<amount>\d+)|an?))?\s+'
+                r'(?P<unit>hours?|hrs?|minutes?|mins?)(?:\s+meeting)?$', re.I), _find_free_time),
+)
+
+def _fast_parse_command(command: str) -> Optional[Dict[str, Any]]:
+    """Match trivial commands locally; None means Gemini is needed"""
+    command = command.strip()
+    for pattern, make_command in _FAST_COMMANDS:
+        match = pattern.match(command)
+        if match:
+            return make_command(match)
+    return None
+
+# Opening ```/```json and closing ``` around a model's JSON reply
+_MARKDOWN_FENCE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+# Structure Gemini is constrained to when parsing a command
+_COMMAND_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'action': {'type': 'string', 'enum': ['create', 'update', 'delete', 'find', 'list']},
+        'title': {'type': 'string'},
+        'description': {'type': 'string'},
+        'date': {'type': 'string'},
+        'start_time': {'type': 'string'},
+        'end_time': {'type': 'string'},
+        'duration_minutes': {'type': 'integer'},
+        'location': {'type': 'string'},
+        'attendees': {'type': 'array', 'items': {'type': 'string'}},
+        'recurrence': {'type': 'string', 'enum': ['daily', 'weekly', 'monthly', 'yearly', 'none']},
+        'reminders': {'type': 'array', 'items': {'type': 'integer'}},
+        'timezone': {'type': 'string'},
+    },
+    'required': ['action'],
+}
+
+# Static parts of the command prompt, joined around the per-call values
+_COMMAND_PROMPT_HEAD = """
+        Parse the following calendar command and extract structured information:
+        Command: \""""
+_COMMAND_PROMPT_SCHEMA = """"
+        
+        Extract the following information in JSON format:
+        {
+            "action": "create|update|delete|find|list",
+            "title": "event title",
+            "description": "event description", 
+            "date": "YYYY-MM-DD",
+            "start_time": "HH:MM",
+            "end_time": "HH:MM",
+            "duration_minutes": number,
+            "location": "location if mentioned",
+            "attendees": ["email1", "email2"],
+            "recurrence": "daily|weekly|monthly|yearly|none",
+            "reminders": [minutes_before],
+            "timezone": "timezone if mentioned"
+        }
+        
+        Today's date is: """
+_COMMAND_PROMPT_TIME = """
+        Current time is: """
+_COMMAND_PROMPT_TAIL = """
+        
+        Examples:
+        - "Schedule meeting tomorrow at 2 PM with john@example.com" 
+        - "Create daily standup at 9 AM starting Monday"
+        - "Find free time for 1 hour meeting next week"
+        - "Delete the meeting with client on Friday"
+        
+        Return only valid JSON without any markdown formatting.
+        """
+
+_SUMMARY_PROMPT_HEAD = """
+        Analyze the following meeting notes and provide:
+        1. A concise summary
+        2. Key action items with assignees (if mentioned)
+        3. Important decisions made
+        4. Follow-up items
+        
+        Meeting Notes:
+        """
+_SUMMARY_PROMPT_TAIL = """
+        
+        Provide the response in JSON format:
+        {
+            "summary": "Brief meeting summary",
+            "action_items": [
+                {
+                    "task": "Description of task",
+                    "assignee": "Person assigned (if mentioned)",
+                    "due_date": "Due date if mentioned",
+                    "priority": "high|medium|low"
+                }
+            ],
+            "key_decisions": ["Decision 1", "Decision 2"],
+            "follow_ups": ["Follow-up item 1", "Follow-up item 2"],
+            "next_meeting": "Date/time if mentioned"
+        }
+        
+        Return only valid JSON without markdown formatting.
+        """
+
+# Parsed Gemini responses for repeated commands, shared across assistants
+_COMMAND_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_COMMAND_CACHE_LOCK = threading.Lock()
+
+# Summaries of identical meeting notes, keyed by a hash of the notes
+_SUMMARY_CACHE: TTLCache = TTLCache(maxsize=256, ttl=3600)
+_SUMMARY_CACHE_LOCK = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
 SCOPES = [
     'https://www.googleapis.com/auth/calendar',
     'https://www.googleapis.com/auth/calendar.events'
 ]
 
-@dataclass
+@lru_cache(maxsize=512)
+def _tz(name: str) -> ZoneInfo:
+    """ZoneInfo by name, held strongly; ZoneInfo's own cache keeps only a few"""
+    return ZoneInfo(name)
+
+# Zones loaded at import so their TZif files are read before the first request
+_COMMON_TZS = (
+    "UTC", "US/Pacific", "US/Eastern", "Europe/London", "Europe/Berlin",
+    "Asia/Kolkata", "Asia/Tokyo", "Australia/Sydney", settings.DEFAULT_TIMEZONE,
+)
+for _name in _COMMON_TZS:
+    try:
+        _tz(_name)
+    except ZoneInfoNotFoundError:
+        pass
+
+def _parse_event_dt(value: str, default_tz) -> datetime:
+    """Parse a Calendar API start/end value (RFC 3339 or YYYY-MM-DD).
+
+    fromisoformat accepts both forms and a trailing 'Z' natively on
+    Python 3.11+; naive values are placed in ``default_tz``.
+    """
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=default_tz)
+    return dt
+
+def _event_bounds(event: Dict, default_tz) -> Tuple[datetime, datetime]:
+    """Aware (start, end) of a parsed event dict; all-day events included"""
+    return _parse_event_dt(event['start'], default_tz), _parse_event_dt(event['end'], default_tz)
+
+def _event_span(event: Dict, default_tz) -> Tuple[float, float]:
+    """(start, end) of a parsed event dict as epoch seconds"""
+    start, end = _event_bounds(event, default_tz)
+    return start.timestamp(), end.timestamp()
+
+def _overlaps(span: Tuple[float, float], start_ts: float, end_ts: float) -> bool:
+    return span[0] < end_ts and span[1] > start_ts
+
+class _EventTime(msgspec.Struct):
+    dateTime: datetime
+    timeZone: str
+
+class _Attendee(msgspec.Struct):
+    email: str
+
+class _Reminders(msgspec.Struct):
+    overrides: List[Dict]
+    useDefault: bool = False
+
+class _EventBody(msgspec.Struct, omit_defaults=True):
+    """Calendar API event resource as sent on insert"""
+    summary: str
+    description: str
+    location: str
+    start: _EventTime
+    end: _EventTime
+    attendees: Optional[List[_Attendee]] = None
+    recurrence: Optional[List[str]] = None
+    reminders: Optional[_Reminders] = None
+
+def _event_body(event: "CalendarEvent") -> _EventBody:
+    return _EventBody(
+        summary=event.summary,
+        description=event.description,
+        location=event.location,
+        start=_EventTime(event.start_datetime, event.timezone),
+        end=_EventTime(event.end_datetime, event.timezone),
+        attendees=[_Attendee(email) for email in event.attendees] or None,
+        recurrence=event.recurrence or None,
+        reminders=_Reminders(event.reminders) if event.reminders else None,
+    )
+
+def _encode_event_body(event: "CalendarEvent") -> bytes:
+    return msgspec.json.encode(_event_body(event))
+
+class _EventPatch(msgspec.Struct, omit_defaults=True):
+    """Partial event resource for events().patch; unset fields are left as-is"""
+    summary: Optional[str] = None
+    description: Optional[str] = None
+    location: Optional[str] = None
+    start: Optional[_EventTime] = None
+    end: Optional[_EventTime] = None
+
+def _encode_event_patch(event: "CalendarEvent") -> bytes:
+    return msgspec.json.encode(_EventPatch(
+        summary=event.summary or None,
+        description=event.description or None,
+        location=event.location or None,
+        start=_EventTime(event.start_datetime, event.timezone) if event.start_datetime else None,
+        end=_EventTime(event.end_datetime, event.timezone) if event.end_datetime else None,
+    ))
+
+def _with_json_body(request, body: bytes):
+    """Swap a msgspec-encoded JSON body into a single (non-batch) request.
+
+    googleapiclient's HttpRequest sends ``body`` as-is and takes the
+    Content-Length from ``body_size``, so both are set together. Batch
+    requests must not use this: BatchHttpRequest re-serializes each part
+    through a str MIME generator that mangles non-ASCII bytes, so they keep
+    googleapiclient's own (ASCII-escaped) body=dict encoding.
+    """
+    request.body = body
+    request.body_size = len(body)
+    return request
+
+@lru_cache(maxsize=1)
+def _calendar_service():
+    """Calendar v3 client built once from the bundled discovery document.
+
+    The service carries no credentials; every request is executed with the
+    calling manager's authorized transport.
+    """
+    return build('calendar', 'v3', http=httplib2.Http(), cache_discovery=False, static_discovery=True)
+
+# Most requests Google accepts in one batch call
+_BATCH_LIMIT = 50
+
+# Only the parts of each event _parse_event reads (plus paging/sync tokens)
+_EVENT_LIST_FIELDS = (
+    'items(id,summary,description,start,end,location,attendees/email,status,htmlLink),'
+    'nextPageToken,nextSyncToken'
+)
+
+# Calendars whose incremental-sync state a manager keeps; the least
+# recently queried are dropped beyond this
+_SYNC_MAX_CALENDARS = 32
+# Synced events that ended longer ago than this are dropped; free-slot
+# queries only look forward
+_SYNC_RETENTION = timedelta(days=7)
+
+@dataclass(slots=True)
+class _SyncState:
+    """Incremental-sync state for one calendar"""
+    # Held across the calendar's listing, so only callers for the same
+    # calendar wait on it
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    token: Optional[str] = None
+    # Replaced, never mutated, so readers can use it without the lock
+    events: Dict[str, Dict] = field(default_factory=dict)
+
+@dataclass(slots=True)
 class CalendarEvent:
     """Data class for calendar events"""
     id: Optional[str] = None
@@ -34,7 +316,7 @@ class CalendarEvent:
     start_datetime: Optional[datetime] = None
     end_datetime: Optional[datetime] = None
     location: str = ""
-    attendees: List[str] = None
+    attendees: Sequence[str] = None
     recurrence: List[str] = None
     reminders: List[Dict] = None
     calendar_id: str = "primary"
@@ -54,7 +336,22 @@ class GoogleCalendarManager:
         self.token_file = token_file or settings.GOOGLE_CALENDAR_TOKEN_FILE
         self.service = None
         self.credentials = None
-        self.default_timezone = pytz.timezone(settings.DEFAULT_TIMEZONE)
+        self.default_timezone = _tz(settings.DEFAULT_TIMEZONE)
+        self._local = threading.local()
+        # (calendar_id, local day) -> (sorted start timestamps, [(start, end, event)])
+        self._day_index: TTLCache = TTLCache(maxsize=256, ttl=60)
+        self._day_index_lock = threading.Lock()
+        # calendar_id -> _SyncState; _sync_lock guards the mapping only and
+        # is never held across network I/O
+        self._sync: LRUCache = LRUCache(maxsize=_SYNC_MAX_CALENDARS)
+        self._sync_lock = threading.Lock()
+        
+    def _http(self) -> AuthorizedHttp:
+        """Per-thread authorized transport; httplib2.Http is not thread-safe"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+        return http
         
     def authenticate(self) -> bool:
         """Authenticate with Google Calendar API"""
@@ -63,129 +360,115 @@ class GoogleCalendarManager:
             
             # Load existing token
             if os.path.exists(self.token_file):
-                with open(self.token_file, 'rb') as token:
-                    creds = pickle.load(token)
+                creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
             
             # If no valid credentials, get new ones
             if not creds or not creds.valid:
                 if creds and creds.expired and creds.refresh_token:
                     try:
                         creds.refresh(Request())
-                        print("🔄 Refreshed existing credentials")
+                        logger.info("Refreshed existing credentials")
                     except Exception as e:
-                        print(f"❌ Failed to refresh credentials: {e}")
+                        logger.error("Failed to refresh credentials: %s", e)
                         creds = None
                 
                 if not creds:
                     if not os.path.exists(self.credentials_file):
-                        print(f"❌ Credentials file not found: {self.credentials_file}")
-                        print("📝 Please download credentials.json from Google Cloud Console")
+                        logger.error("Credentials file not found: %s", self.credentials_file)
+                        logger.info("Please download credentials.json from Google Cloud Console")
                         return False
                     
                     flow = InstalledAppFlow.from_client_secrets_file(
                         self.credentials_file, SCOPES)
                     creds = flow.run_local_server(port=0)
-                    print("✅ New credentials obtained")
+                    logger.info("New credentials obtained")
                 
                 # Save credentials for next run
-                with open(self.token_file, 'wb') as token:
-                    pickle.dump(creds, token)
+                with open(self.token_file, 'w') as token:
+                    token.write(creds.to_json())
             
             self.credentials = creds
-            self.service = build('calendar', 'v3', credentials=creds)
-            print("✅ Google Calendar API authenticated successfully")
+            # Drop transports bound to previous credentials
+            self._local = threading.local()
+            self.service = _calendar_service()
+            logger.info("Google Calendar API authenticated successfully")
             return True
             
         except Exception as e:
-            print(f"❌ Authentication failed: {e}")
+            logger.error("Authentication failed: %s", e)
             return False
     
     def create_event(self, event: CalendarEvent) -> Optional[str]:
         """Create a new calendar event"""
         try:
-            # Prepare event data
-            event_body = {
-                'summary': event.summary,
-                'description': event.description,
-                'location': event.location,
-                'start': {
-                    'dateTime': event.start_datetime.isoformat(),
-                    'timeZone': event.timezone,
-                },
-                'end': {
-                    'dateTime': event.end_datetime.isoformat(),
-                    'timeZone': event.timezone,
-                },
-            }
-            
-            # Add attendees
-            if event.attendees:
-                event_body['attendees'] = [{'email': email} for email in event.attendees]
-            
-            # Add recurrence
-            if event.recurrence:
-                event_body['recurrence'] = event.recurrence
-            
-            # Add reminders
-            if event.reminders:
-                event_body['reminders'] = {
-                    'useDefault': False,
-                    'overrides': event.reminders
-                }
-            
-            # Create the event
-            created_event = self.service.events().insert(
-                calendarId=event.calendar_id, 
-                body=event_body
-            ).execute()
+            # Create the event; the body is encoded by msgspec in one pass
+            # instead of googleapiclient's json.dumps of a hand-built dict
+            request = _with_json_body(
+                self.service.events().insert(calendarId=event.calendar_id, body={}),
+                _encode_event_body(event)
+            )
+            created_event = request.execute(http=self._http())
             
-            print(f"✅ Event created: {created_event['id']}")
+            self._invalidate_day_index()
+            logger.info("Event created: %s", created_event['id'])
             return created_event['id']
             
         except HttpError as error:
-            print(f"❌ Error creating event: {error}")
+            logger.error("Error creating event: %s", error)
             return None
     
+    def create_events_batch(self, events: List[CalendarEvent]) -> List[Optional[str]]:
+        """Create many events using batch requests; returns ids in input order (None on failure)"""
+        event_ids: List[Optional[str]] = [None] * len(events)
+        
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                logger.error("Error creating event: %s", exception)
+                return
+            event_ids[int(request_id)] = response['id']
+        
+        for offset in range(0, len(events), _BATCH_LIMIT):
+            try:
+                batch = self.service.new_batch_http_request(callback=_collect)
+                for index in range(offset, min(offset + _BATCH_LIMIT, len(events))):
+                    event = events[index]
+                    # Plain dict body: googleapiclient's json.dumps escapes
+                    # non-ASCII, which the batch MIME serializer needs
+                    request = self.service.events().insert(
+                        calendarId=event.calendar_id,
+                        body=msgspec.to_builtins(_event_body(event))
+                    )
+                    batch.add(request, request_id=str(index))
+                batch.execute(http=self._http())
+            except HttpError as error:
+                logger.error("Error creating events: %s", error)
+        
+        if any(event_ids):
+            self._invalidate_day_index()
+        logger.info("Created %s of %s events", sum(1 for event_id in event_ids if event_id), len(events))
+        return event_ids
+    
     def update_event(self, event_id: str, event: CalendarEvent) -> bool:
         """Update an existing event"""
         try:
-            # Get existing event
-            existing_event = self.service.events().get(
-                calendarId=event.calendar_id,
-                eventId=event_id
-            ).execute()
-            
-            # Update fields
-            existing_event.update({
-                'summary': event.summary or existing_event.get('summary'),
-                'description': event.description or existing_event.get('description'),
-                'location': event.location or existing_event.get('location'),
-            })
-            
-            if event.start_datetime:
-                existing_event['start'] = {
-                    'dateTime': event.start_datetime.isoformat(),
-                    'timeZone': event.timezone,
-                }
-            
-            if event.end_datetime:
-                existing_event['end'] = {
-                    'dateTime': event.end_datetime.isoformat(),
-                    'timeZone': event.timezone,
-                }
-            
-            # Update the event
-            updated_event = self.service.events().update(
-                calendarId=event.calendar_id,
-                eventId=event_id,
-                body=existing_event
-            ).execute()
+            # Patch only the fields that were provided; no read-modify-write
+            request = _with_json_body(
+                self.service.events().patch(
+                    calendarId=event.calendar_id,
+                    eventId=event_id,
+                    body={},
+                    fields='id'
+                ),
+                _encode_event_patch(event)
+            )
+            request.execute(http=self._http())
             
-            print(f"✅ Event updated: {event_id}")
+            self._invalidate_day_index()
+            logger.info("Event updated: %s", event_id)
             return True
             
         except HttpError as error:
-            print(f"❌ Error updating event: {error}")
+            logger.error("Error updating event: %s", error)
             return False
     
     def delete_event(self, event_id: str, calendar_id: str = "primary") -> bool:
@@ -194,13 +477,14 @@ class GoogleCalendarManager:
             self.service.events().delete(
                 calendarId=calendar_id,
                 eventId=event_id
-            ).execute()
+            ).execute(http=self._http())
             
-            print(f"✅ Event deleted: {event_id}")
+            self._invalidate_day_index()
+            logger.info("Event deleted: %s", event_id)
             return True
             
         except HttpError as error:
-            print(f"❌ Error deleting event: {error}")
+            logger.error("Error deleting event: %s", error)
             return False
     
     def get_events(self, 
@@ -221,33 +505,231 @@ class GoogleCalendarManager:
                 timeMax=end_date.isoformat(),
                 maxResults=max_results,
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+                orderBy='startTime',
+                fields=_EVENT_LIST_FIELDS
+            ).execute(http=self._http())
             
             events = events_result.get('items', [])
-            
-            parsed_events = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                parsed_events.append({
-                    'id': event['id'],
-                    'summary': event.get('summary', 'No Title'),
-                    'description': event.get('description', ''),
-                    'start': start,
-                    'end': end,
-                    'location': event.get('location', ''),
-                    'attendees': [att.get('email') for att in event.get('attendees', [])],
-                    'status': event.get('status', ''),
-                    'html_link': event.get('htmlLink', '')
-                })
-            
-            return parsed_events
+            return [self._parse_event(event) for event in events]
             
         except HttpError as error:
-            print(f"❌ Error getting events: {error}")
+            logger.error("Error getting events: %s", error)
             return []
+    
+    def get_events_multi(self,
+                         calendar_ids: List[str],
+                         start_date: datetime,
+                         end_date: datetime,
+                         max_results: int = 100) -> Dict[str, List[Dict]]:
+        """Get events from several calendars in a single batch HTTP request"""
+        results: Dict[str, List[Dict]] = {calendar_id: [] for calendar_id in calendar_ids}
+        
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                logger.error("Error getting events for %s: %s", request_id, exception)
+                return
+            results[request_id] = [self._parse_event(event) for event in response.get('items', [])]
+        
+        try:
+            batch = self.service.new_batch_http_request(callback=_collect)
+            for calendar_id in results:
+                batch.add(
+                    self.service.events().list(
+                        calendarId=calendar_id,
+                        timeMin=start_date.isoformat(),
+                        timeMax=end_date.isoformat(),
+                        maxResults=max_results,
+                        singleEvents=True,
+                        orderBy='startTime',
+                        fields=_EVENT_LIST_FIELDS
+                    ),
+                    request_id=calendar_id
+                )
+            batch.execute(http=self._http())
+        except HttpError as error:
+            logger.error("Error getting events: %s", error)
+        
+        return results
+    
+    async def get_events_async(self,
+                               start_date: datetime = None,
+                               end_date: datetime = None,
+                               calendar_id: str = "primary",
+                               max_results: int = 100) -> List[Dict]:
+        """Non-blocking get_events for use from the event loop"""
+        return await asyncio.to_thread(self.get_events, start_date, end_date, calendar_id, max_results)
+    
+    async def get_events_multi_async(self,
+                                     calendar_ids: List[str],
+                                     start_date: datetime,
+                                     end_date: datetime,
+                                     max_results: int = 100) -> Dict[str, List[Dict]]:
+        """Non-blocking get_events_multi for use from the event loop"""
+        return await asyncio.to_thread(self.get_events_multi, calendar_ids, start_date, end_date, max_results)
+    
+    async def create_event_async(self, event: CalendarEvent) -> Optional[str]:
+        """Non-blocking create_event for use from the event loop"""
+        return await asyncio.to_thread(self.create_event, event)
+    
+    def get_events_synced(self,
+                          calendar_ids: List[str],
+                          start_date: datetime,
+                          end_date: datetime) -> Dict[str, List[Dict]]:
+        """Events overlapping [start_date, end_date) per calendar, kept current
+        with incremental sync.
+
+        The first call per calendar lists it in full and stores the
+        nextSyncToken; later calls only download what changed since. Events
+        that ended more than _SYNC_RETENTION ago are not kept.
+        """
+        start_ts, end_ts = start_date.timestamp(), end_date.timestamp()
+        results = {}
+        for calendar_id in calendar_ids:
+            with self._sync_lock:
+                state = self._sync.get(calendar_id)
+                if state is None:
+                    state = self._sync[calendar_id] = _SyncState()
+            with state.lock:
+                events = self._sync_calendar(calendar_id, state)
+            results[calendar_id] = [
+                event for event in events.values()
+                if _overlaps(_event_span(event, self.default_timezone), start_ts, end_ts)
+            ]
+        return results
+    
+    def list_event_changes(self,
+                           calendar_id: str,
+                           sync_token: Optional[str] = None) -> Tuple[Optional[str], List[Dict], bool]:
+        """Raw event changes since ``sync_token`` (everything when None).
+
+        Returns (nextSyncToken, items, full) where ``full`` is True when the
+        items are a complete listing, either because no token was given or
+        because Google expired it (410) and a full re-list was done.
+        """
+        try:
+            next_token, items = self._list_all(calendar_id, sync_token)
+            return next_token, items, sync_token is None
+        except HttpError as error:
+            if sync_token is None or error.resp.status != 410:
+                raise
+        # Sync token expired; start over with a full listing
+        next_token, items = self._list_all(calendar_id, None)
+        return next_token, items, True
+    
+    def _sync_calendar(self, calendar_id: str, state: _SyncState) -> Dict[str, Dict]:
+        """Apply changes since the last sync to ``state``; caller holds state.lock"""
+        try:
+            next_token, changes, full = self.list_event_changes(calendar_id, state.token)
+        except HttpError as error:
+            logger.error("Error syncing events for %s: %s", calendar_id, error)
+            return state.events
+        
+        # Build a new dict so readers of the previous one are unaffected
+        events = {} if full else dict(state.events)
+        for item in changes:
+            if item.get('status') == 'cancelled':
+                events.pop(item['id'], None)
+            else:
+                events[item['id']] = self._parse_event(item)
+        
+        cutoff = (datetime.now(timezone.utc) - _SYNC_RETENTION).timestamp()
+        events = {
+            event_id: event for event_id, event in events.items()
+            if _event_span(event, self.default_timezone)[1] >= cutoff
+        }
+        
+        state.token, state.events = next_token, events
+        return events
+    
+    def _list_all(self, calendar_id: str, sync_token: Optional[str]) -> Tuple[str, List[Dict]]:
+        """Page through events().list, returning (nextSyncToken, items)"""
+        items = []
+        page_token = None
+        while True:
+            params = {
+                'calendarId': calendar_id,
+                'singleEvents': True,
+                'pageToken': page_token,
+                'fields': _EVENT_LIST_FIELDS,
+            }
+            if sync_token:
+                params['syncToken'] = sync_token
+            response = self.service.events().list(**params).execute(http=self._http())
+            items.extend(response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return response.get('nextSyncToken'), items
+    
+    def get_overlapping_events(self,
+                               calendar_ids: List[str],
+                               start: datetime,
+                               end: datetime) -> Dict[str, List[Tuple[Dict, datetime, datetime]]]:
+        """Events overlapping [start, end) per calendar, with parsed bounds.
+
+        Each calendar's events are fetched one local day at a time, sorted
+        once, and kept briefly so repeated checks are a bisect rather than
+        another list call plus a full scan.
+        """
+        first_day = start.astimezone(self.default_timezone).date()
+        last_day = end.astimezone(self.default_timezone).date()
+        days = [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+        
+        indexes = {}
+        for day in days:
+            with self._day_index_lock:
+                for calendar_id in calendar_ids:
+                    index = self._day_index.get((calendar_id, day))
+                    if index is not None:
+                        indexes[(calendar_id, day)] = index
+            missing = [calendar_id for calendar_id in calendar_ids if (calendar_id, day) not in indexes]
+            if missing:
+                day_start = datetime.combine(day, time.min, self.default_timezone)
+                fetched = self.get_events_multi(missing, day_start, day_start + timedelta(days=1))
+                for calendar_id, events in fetched.items():
+                    indexes[(calendar_id, day)] = index = self._build_day_index(events)
+                    with self._day_index_lock:
+                        self._day_index[(calendar_id, day)] = index
+        
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        results: Dict[str, List[Tuple[Dict, datetime, datetime]]] = {}
+        for calendar_id in calendar_ids:
+            seen = set()
+            hits = []
+            for day in days:
+                starts, intervals = indexes[(calendar_id, day)]
+                # Only events starting before `end` can overlap
+                for event_start, event_end, event in intervals[:bisect_left(starts, end_ts)]:
+                    if event_end.timestamp() > start_ts and event['id'] not in seen:
+                        seen.add(event['id'])
+                        hits.append((event, event_start, event_end))
+            results[calendar_id] = hits
+        return results
+    
+    def _build_day_index(self, events: List[Dict]) -> Tuple[List[float], List[Tuple[datetime, datetime, Dict]]]:
+        intervals = sorted(
+            (_event_bounds(event, self.default_timezone) + (event,) for event in events),
+            key=lambda interval: interval[0]
+        )
+        return [interval[0].timestamp() for interval in intervals], intervals
+    
+    def _invalidate_day_index(self) -> None:
+        with self._day_index_lock:
+            self._day_index.clear()
+    
+    @staticmethod
+    def _parse_event(event: Dict) -> Dict:
+        """Flatten a Calendar API event resource into the dict shape used here"""
+        return {
+            'id': event['id'],
+            'summary': event.get('summary', 'No Title'),
+            'description': event.get('description', ''),
+            'start': event['start'].get('dateTime', event['start'].get('date')),
+            'end': event['end'].get('dateTime', event['end'].get('date')),
+            'location': event.get('location', ''),
+            'attendees': [att.get('email') for att in event.get('attendees', [])],
+            'status': event.get('status', ''),
+            'html_link': event.get('htmlLink', '')
+        }
 
 class SmartScheduler:
     """Intelligent scheduling with conflict resolution"""
@@ -256,6 +738,9 @@ class SmartScheduler:
         self.calendar_manager = calendar_manager
         self.working_hours = (9, 17)  # 9 AM to 5 PM
         self.break_duration = 15  # minutes between meetings
+        # Working hours as second-of-day bounds for _is_working_hours
+        self._work_start_sec = self.working_hours[0] * 3600
+        self._work_end_sec = self.working_hours[1] * 3600
         
     def find_free_slots(self, 
                        start_date: datetime,
@@ -263,79 +748,69 @@ class SmartScheduler:
                        duration_minutes: int,
                        calendars: List[str] = None) -> List[Tuple[datetime, datetime]]:
         """Find available time slots across multiple calendars"""
+        # Return top 10 slots; the scan stops as soon as they are found
+        return list(islice(self._iter_free_slots(start_date, end_date, duration_minutes, calendars), 10))
+    
+    def _iter_free_slots(self,
+                         start_date: datetime,
+                         end_date: datetime,
+                         duration_minutes: int,
+                         calendars: List[str] = None) -> Iterator[Tuple[datetime, datetime]]:
+        """Yield free slots in chronological order"""
         
         if not calendars:
             calendars = ["primary"]
         
         # Ensure timezone awareness
         if start_date.tzinfo is None:
-            start_date = self.calendar_manager.default_timezone.localize(start_date)
+            start_date = start_date.replace(tzinfo=self.calendar_manager.default_timezone)
         if end_date.tzinfo is None:
-            end_date = self.calendar_manager.default_timezone.localize(end_date)
-        
-        # Get all events from specified calendars
-        all_events = []
-        for calendar_id in calendars:
-            events = self.calendar_manager.get_events(start_date, end_date, calendar_id)
-            all_events.extend(events)
+            end_date = end_date.replace(tzinfo=self.calendar_manager.default_timezone)
+        
+        # Incremental sync keeps repeat queries down to the changed events
+        events_by_calendar = self.calendar_manager.get_events_synced(calendars, start_date, end_date)
+        
+        # Parse each event once into epoch seconds and sort numerically;
+        # the gap scan below is then plain float arithmetic
+        local_tz = self.calendar_manager.default_timezone
+        busy = sorted(
+            _event_span(event, local_tz)
+            for events in events_by_calendar.values()
+            for event in events
+        )
         
-        # Sort events by start time
-        all_events.sort(key=lambda x: x['start'])
+        duration_s = duration_minutes * 60
+        break_s = self.break_duration * 60
+        slot_tz = start_date.tzinfo
         
-        free_slots = []
-        current_time = start_date
+        current = start_date.timestamp()
         
-        for event in all_events:
-            # Parse event times and ensure timezone awareness
-            start_str = event['start']
-            end_str = event['end']
-            
-            # Handle both date-only and datetime events
-            if 'T' in start_str:
-                event_start = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                event_end = datetime.fromisoformat(end_str.replace('Z', '+00:00'))
-                
-                # Convert to local timezone if needed
-                if event_start.tzinfo is None:
-                    event_start = self.calendar_manager.default_timezone.localize(event_start)
-                if event_end.tzinfo is None:
-                    event_end = self.calendar_manager.default_timezone.localize(event_end)
-            else:
-                # All-day events
-                event_start = datetime.strptime(start_str, '%Y-%m-%d')
-                event_start = self.calendar_manager.default_timezone.localize(event_start)
-                event_end = datetime.strptime(end_str, '%Y-%m-%d')
-                event_end = self.calendar_manager.default_timezone.localize(event_end)
-            
+        for event_start, event_end in busy:
             # Check if there's a free slot before this event
-            if current_time < event_start:
-                slot_duration = (event_start - current_time).total_seconds() / 60
-                if slot_duration >= duration_minutes + self.break_duration:
-                    # Check if within working hours
-                    if self._is_working_hours(current_time, duration_minutes):
-                        slot_end = current_time + timedelta(minutes=duration_minutes)
-                        free_slots.append((current_time, slot_end))
+            if event_start - current >= duration_s + break_s:
+                slot_start = datetime.fromtimestamp(current, slot_tz)
+                # Check if within working hours
+                if self._is_working_hours(slot_start, duration_minutes):
+                    yield slot_start, slot_start + timedelta(minutes=duration_minutes)
             
-            current_time = max(current_time, event_end + timedelta(minutes=self.break_duration))
+            current = max(current, event_end + break_s)
         
         # Check for slots after the last event
-        if current_time < end_date:
-            slot_duration = (end_date - current_time).total_seconds() / 60
-            if slot_duration >= duration_minutes and self._is_working_hours(current_time, duration_minutes):
-                slot_end = current_time + timedelta(minutes=duration_minutes)
-                free_slots.append((current_time, slot_end))
-        
-        return free_slots[:10]  # Return top 10 slots
+        if end_date.timestamp() - current >= duration_s:
+            slot_start = datetime.fromtimestamp(current, slot_tz)
+            if self._is_working_hours(slot_start, duration_minutes):
+                yield slot_start, slot_start + timedelta(minutes=duration_minutes)
     
     def _is_working_hours(self, start_time: datetime, duration_minutes: int) -> bool:
         """Check if time slot is within working hours"""
-        start_hour = start_time.hour
-        end_time = start_time + timedelta(minutes=duration_minutes)
-        end_hour = end_time.hour
-        
-        return (start_hour >= self.working_hours[0] and 
-                end_hour <= self.working_hours[1] and
-                start_time.weekday() < 5)  # Monday-Friday
+        # Local wall-clock seconds since the epoch; day 0 (1970-01-01) was a Thursday
+        local = start_time.timestamp() + start_time.utcoffset().total_seconds()
+        second_of_day = local % 86400
+        weekday = (int(local // 86400) + 3) % 7
+        
+        return (self._work_start_sec <= second_of_day and
+                second_of_day + duration_minutes * 60 <= self._work_end_sec and
+                weekday < 5)  # Monday-Friday
     
     def detect_conflicts(self, event: CalendarEvent, calendars: List[str] = None) -> List[Dict]:
         """Detect scheduling conflicts"""
@@ -344,44 +819,19 @@ class SmartScheduler:
         
         conflicts = []
         
-        # Check each calendar for conflicts
-        for calendar_id in calendars:
-            events = self.calendar_manager.get_events(
-                event.start_datetime - timedelta(hours=1),
-                event.end_datetime + timedelta(hours=1),
-                calendar_id
-            )
-            
-            for existing_event in events:
-                # Parse event times and ensure timezone awareness
-                start_str = existing_event['start']
-                end_str = existing_event['end']
-                
-                # Handle both date-only and datetime events
-                if 'T' in start_str:
-                    existing_start = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                    existing_end = datetime.fromisoformat(end_str.replace('Z', '+00:00'))
-                    
-                    # Convert to local timezone if needed
-                    if existing_start.tzinfo is None:
-                        existing_start = self.calendar_manager.default_timezone.localize(existing_start)
-                    if existing_end.tzinfo is None:
-                        existing_end = self.calendar_manager.default_timezone.localize(existing_end)
-                else:
-                    # All-day events
-                    existing_start = datetime.strptime(start_str, '%Y-%m-%d')
-                    existing_start = self.calendar_manager.default_timezone.localize(existing_start)
-                    existing_end = datetime.strptime(end_str, '%Y-%m-%d')
-                    existing_end = self.calendar_manager.default_timezone.localize(existing_end)
-                
-                # Check for overlap
-                if (event.start_datetime < existing_end and event.end_datetime > existing_start):
-                    conflicts.append({
-                        'calendar_id': calendar_id,
-                        'conflicting_event': existing_event,
-                        'overlap_start': max(event.start_datetime, existing_start),
-                        'overlap_end': min(event.end_datetime, existing_end)
-                    })
+        overlapping = self.calendar_manager.get_overlapping_events(
+            calendars, event.start_datetime, event.end_datetime
+        )
+        
+        # Everything returned already overlaps the proposed event
+        for calendar_id, hits in overlapping.items():
+            for existing_event, existing_start, existing_end in hits:
+                conflicts.append({
+                    'calendar_id': calendar_id,
+                    'conflicting_event': existing_event,
+                    'overlap_start': max(event.start_datetime, existing_start),
+                    'overlap_end': min(event.end_datetime, existing_end)
+                })
         
         return conflicts
     
@@ -393,17 +843,19 @@ class SmartScheduler:
         search_start = event.start_datetime.replace(hour=self.working_hours[0], minute=0)
         search_end = search_start + timedelta(days=7)
         
-        free_slots = self.find_free_slots(search_start, search_end, duration_minutes)
+        free_slots = islice(self._iter_free_slots(search_start, search_end, duration_minutes), num_suggestions)
+        # CalendarEvent never mutates attendees, so every alternative shares one tuple
+        attendees = tuple(event.attendees)
         
         alternatives = []
-        for i, (start, end) in enumerate(free_slots[:num_suggestions]):
+        for start, end in free_slots:
             alt_event = CalendarEvent(
                 summary=event.summary,
                 description=event.description,
                 start_datetime=start,
                 end_datetime=end,
                 location=event.location,
-                attendees=event.attendees.copy(),
+                attendees=attendees,
                 calendar_id=event.calendar_id,
                 timezone=event.timezone
             )
@@ -435,73 +887,132 @@ class AICalendarAssistant:
     
     def parse_natural_language_command(self, command: str) -> Dict[str, Any]:
         """Parse natural language commands using Gemini"""
+        fast = _fast_parse_command(command)
+        if fast is not None:
+            return fast
         
-        prompt = f"""
-        Parse the following calendar command and extract structured information:
-        Command: "{command}"
-        
-        Extract the following information in JSON format:
-        {{
-            "action": "create|update|delete|find|list",
-            "title": "event title",
-            "description": "event description", 
-            "date": "YYYY-MM-DD",
-            "start_time": "HH:MM",
-            "end_time": "HH:MM",
-            "duration_minutes": number,
-            "location": "location if mentioned",
-            "attendees": ["email1", "email2"],
-            "recurrence": "daily|weekly|monthly|yearly|none",
-            "reminders": [minutes_before],
-            "timezone": "timezone if mentioned"
-        }}
-        
-        Today's date is: {datetime.now().strftime('%Y-%m-%d')}
-        Current time is: {datetime.now().strftime('%H:%M')}
-        
-        Examples:
-        - "Schedule meeting tomorrow at 2 PM with john@example.com" 
-        - "Create daily standup at 9 AM starting Monday"
-        - "Find free time for 1 hour meeting next week"
-        - "Delete the meeting with client on Friday"
-        
-        Return only valid JSON without any markdown formatting.
-        """
+        cache_key = self._command_cache_key(command)
+        with _COMMAND_CACHE_LOCK:
+            cached = _COMMAND_CACHE.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
         
         try:
             response = self.model.generate_content(
-                prompt,
+                self._build_command_prompt(command),
                 safety_settings=self.safety_settings,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.1,
-                    top_p=0.1,
-                    top_k=16,
-                    max_output_tokens=1024,
-                )
+                generation_config=self._command_generation_config()
             )
+            parsed_command = self._parse_command_response(response)
             
-            # Clean the response and parse JSON
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:-3].strip()
-            elif response_text.startswith('```'):
-                response_text = response_text[3:-3].strip()
-            
-            parsed_command = json.loads(response_text)
-            return parsed_command
+        except Exception as e:
+            logger.error("Error parsing command: %s", e)
+            return {}
+        
+        self._remember_command(cache_key, parsed_command)
+        return parsed_command
+    
+    async def parse_natural_language_command_async(self, command: str) -> Dict[str, Any]:
+        """Non-blocking parse_natural_language_command for use from the event loop"""
+        fast = _fast_parse_command(command)
+        if fast is not None:
+            return fast
+        
+        cache_key = self._command_cache_key(command)
+        with _COMMAND_CACHE_LOCK:
+            cached = _COMMAND_CACHE.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        try:
+            response = await self.model.generate_content_async(
+                self._build_command_prompt(command),
+                safety_settings=self.safety_settings,
+                generation_config=self._command_generation_config()
+            )
+            parsed_command = self._parse_command_response(response)
             
         except Exception as e:
-            print(f"❌ Error parsing command: {e}")
+            logger.error("Error parsing command: %s", e)
             return {}
+        
+        self._remember_command(cache_key, parsed_command)
+        return parsed_command
+    
+    @staticmethod
+    def _command_cache_key(command: str) -> Tuple[str, str]:
+        """Normalized command plus today's date, so relative dates expire at midnight"""
+        return command.strip().lower(), datetime.now().strftime('%Y-%m-%d')
+    
+    @staticmethod
+    def _remember_command(cache_key: Tuple[str, str], parsed_command: Dict[str, Any]) -> None:
+        if parsed_command:
+            with _COMMAND_CACHE_LOCK:
+                _COMMAND_CACHE[cache_key] = copy.deepcopy(parsed_command)
+    
+    @staticmethod
+    def _build_command_prompt(command: str) -> str:
+        """Build the Gemini prompt for a calendar command"""
+        now = datetime.now()
+        return ''.join((
+            _COMMAND_PROMPT_HEAD, command,
+            _COMMAND_PROMPT_SCHEMA, now.strftime('%Y-%m-%d'),
+            _COMMAND_PROMPT_TIME, now.strftime('%H:%M'),
+            _COMMAND_PROMPT_TAIL,
+        ))
+    
+    @staticmethod
+    def _command_generation_config() -> genai.types.GenerationConfig:
+        # JSON mode with a schema: the model can only emit a matching object
+        return genai.types.GenerationConfig(
+            temperature=0.1,
+            top_p=0.1,
+            top_k=16,
+            max_output_tokens=256,
+            response_mime_type='application/json',
+            response_schema=_COMMAND_SCHEMA,
+        )
+    
+    @staticmethod
+    def _parse_command_response(response) -> Dict[str, Any]:
+        """Decode the JSON-mode Gemini response"""
+        return orjson.loads(response.text)
     
     def execute_command(self, command: str) -> Dict[str, Any]:
         """Execute natural language calendar command"""
         
-        print(f"🤖 Processing: {command}")
+        logger.info("Processing: %s", command)
         
         # Parse the command
         parsed = self.parse_natural_language_command(command)
+        return self._dispatch_parsed(parsed)
+    
+    async def execute_command_async(self, command: str) -> Dict[str, Any]:
+        """Execute a command without blocking the event loop.
+
+        The Gemini parse and the calendar read that conflict detection
+        needs are independent, so both start at once; the read only warms
+        the manager's day index, which detect_conflicts then hits.
+        """
+        logger.info("Processing: %s", command)
         
+        parsed, _ = await asyncio.gather(
+            self.parse_natural_language_command_async(command),
+            self._prefetch_conflict_window()
+        )
+        return await asyncio.to_thread(self._dispatch_parsed, parsed)
+    
+    async def _prefetch_conflict_window(self) -> None:
+        now = datetime.now(self.calendar_manager.default_timezone)
+        try:
+            await asyncio.to_thread(
+                self.calendar_manager.get_overlapping_events, ["primary"], now, now + timedelta(days=2)
+            )
+        except Exception as e:
+            # Only a warm-up; detect_conflicts fetches on a miss
+            logger.warning("Calendar prefetch failed: %s", e)
+    
+    def _dispatch_parsed(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
         if not parsed:
             return {"success": False, "message": "Could not understand the command"}
         
@@ -546,12 +1057,12 @@ class AICalendarAssistant:
             end_time = end_dt.strftime('%H:%M')
         
         # Create datetime objects
-        start_datetime = self.calendar_manager.default_timezone.localize(
-            datetime.strptime(f"{event_date} {start_time}", '%Y-%m-%d %H:%M')
-        )
-        end_datetime = self.calendar_manager.default_timezone.localize(
-            datetime.strptime(f"{event_date} {end_time}", '%Y-%m-%d %H:%M')
-        )
+        start_datetime = datetime.strptime(
+            f"{event_date} {start_time}", '%Y-%m-%d %H:%M'
+        ).replace(tzinfo=self.calendar_manager.default_timezone)
+        end_datetime = datetime.strptime(
+            f"{event_date} {end_time}", '%Y-%m-%d %H:%M'
+        ).replace(tzinfo=self.calendar_manager.default_timezone)
         
         # Create event object
         event = CalendarEvent(
@@ -594,8 +1105,8 @@ class AICalendarAssistant:
                 "conflicts": conflicts,
                 "alternatives": [
                     {
-                        "start": alt.start_datetime.isoformat(),
-                        "end": alt.end_datetime.isoformat(),
+                        "start": alt.start_datetime,
+                        "end": alt.end_datetime,
                         "start_formatted": alt.start_datetime.strftime('%Y-%m-%d %H:%M'),
                         "end_formatted": alt.end_datetime.strftime('%Y-%m-%d %H:%M')
                     } for alt in alternatives
@@ -634,8 +1145,8 @@ class AICalendarAssistant:
         if parsed.get('date'):
             try:
                 specific_date = datetime.strptime(parsed['date'], '%Y-%m-%d')
-                start_date = self.calendar_manager.default_timezone.localize(
-                    specific_date.replace(hour=9, minute=0)
+                start_date = specific_date.replace(
+                    hour=9, minute=0, tzinfo=self.calendar_manager.default_timezone
                 )
                 end_date = start_date.replace(hour=17, minute=0)
             except ValueError:
@@ -646,8 +1157,8 @@ class AICalendarAssistant:
         formatted_slots = []
         for start, end in free_slots:
             formatted_slots.append({
-                "start": start.isoformat(),
-                "end": end.isoformat(),
+                "start": start,
+                "end": end,
                 "start_formatted": start.strftime('%A, %B %d at %I:%M %p'),
                 "end_formatted": end.strftime('%I:%M %p'),
                 "duration_minutes": duration_minutes
@@ -671,7 +1182,7 @@ class AICalendarAssistant:
         if parsed.get('date'):
             try:
                 specific_date = datetime.strptime(parsed['date'], '%Y-%m-%d')
-                start_date = self.calendar_manager.default_timezone.localize(specific_date)
+                start_date = specific_date.replace(tzinfo=self.calendar_manager.default_timezone)
                 end_date = start_date + timedelta(days=1)
             except ValueError:
                 pass
@@ -680,26 +1191,7 @@ class AICalendarAssistant:
         
         formatted_events = []
         for event in events:
-            # Parse event times and ensure timezone awareness
-            start_str = event['start']
-            end_str = event['end']
-            
-            # Handle both date-only and datetime events
-            if 'T' in start_str:
-                start_dt = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                end_dt = datetime.fromisoformat(end_str.replace('Z', '+00:00'))
-                
-                # Convert to local timezone if needed
-                if start_dt.tzinfo is None:
-                    start_dt = self.calendar_manager.default_timezone.localize(start_dt)
-                if end_dt.tzinfo is None:
-                    end_dt = self.calendar_manager.default_timezone.localize(end_dt)
-            else:
-                # All-day events
-                start_dt = datetime.strptime(start_str, '%Y-%m-%d')
-                start_dt = self.calendar_manager.default_timezone.localize(start_dt)
-                end_dt = datetime.strptime(end_str, '%Y-%m-%d')
-                end_dt = self.calendar_manager.default_timezone.localize(end_dt)
+            start_dt, end_dt = _event_bounds(event, self.calendar_manager.default_timezone)
             
             formatted_events.append({
                 "id": event['id'],
@@ -731,34 +1223,13 @@ class AICalendarAssistant:
     def summarize_meeting_notes(self, meeting_notes: str) -> Dict[str, Any]:
         """Summarize meeting notes and extract action items using Gemini"""
         
-        prompt = f"""
-        Analyze the following meeting notes and provide:
-        1. A concise summary
-        2. Key action items with assignees (if mentioned)
-        3. Important decisions made
-        4. Follow-up items
+        cache_key = hashlib.blake2b(meeting_notes.encode(), digest_size=16).hexdigest()
+        with _SUMMARY_CACHE_LOCK:
+            cached = _SUMMARY_CACHE.get(cache_key)
+        if cached is not None:
+            return {"success": True, "summary_data": copy.deepcopy(cached)}
         
-        Meeting Notes:
-        {meeting_notes}
-        
-        Provide the response in JSON format:
-        {{
-            "summary": "Brief meeting summary",
-            "action_items": [
-                {{
-                    "task": "Description of task",
-                    "assignee": "Person assigned (if mentioned)",
-                    "due_date": "Due date if mentioned",
-                    "priority": "high|medium|low"
-                }}
-            ],
-            "key_decisions": ["Decision 1", "Decision 2"],
-            "follow_ups": ["Follow-up item 1", "Follow-up item 2"],
-            "next_meeting": "Date/time if mentioned"
-        }}
-        
-        Return only valid JSON without markdown formatting.
-        """
+        prompt = "".join((_SUMMARY_PROMPT_HEAD, meeting_notes, _SUMMARY_PROMPT_TAIL))
         
         try:
             response = self.model.generate_content(
@@ -773,20 +1244,16 @@ class AICalendarAssistant:
             )
             
             # Clean and parse response
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:-3].strip()
-            elif response_text.startswith('```'):
-                response_text = response_text[3:-3].strip()
-            
-            summary_data = json.loads(response_text)
+            summary_data = orjson.loads(_MARKDOWN_FENCE.sub('', response.text).strip())
+            with _SUMMARY_CACHE_LOCK:
+                _SUMMARY_CACHE[cache_key] = copy.deepcopy(summary_data)
             return {
                 "success": True,
                 "summary_data": summary_data
             }
             
         except Exception as e:
-            print(f"❌ Error summarizing notes: {e}")
+            logger.error("Error summarizing notes: %s", e)
             return {"success": False, "message": f"Failed to summarize: {e}"}
 
 
@@ -795,42 +1262,75 @@ class CalendarSync:
     
     def __init__(self, calendar_manager: GoogleCalendarManager):
         self.calendar_manager = calendar_manager
+        # source_calendar_id -> nextSyncToken from the last successful sync
+        self._sync_tokens: Dict[str, str] = {}
+        # target_calendar_id -> {content hash of a source event: id of its copy}
+        self._synced: Dict[str, Dict[str, str]] = {}
+        # source_calendar_id -> {event id: parsed event} for future events not
+        # yet copied everywhere: outside the window so far, or a failed copy.
+        # The sync token only reports changes, so these are re-checked each run
+        self._pending: Dict[str, Dict[str, Dict]] = {}
+    
+    @staticmethod
+    def _content_hash(event: Dict) -> str:
+        """Short fingerprint of what a copy carries over; not security-sensitive"""
+        attendees = ','.join(sorted(filter(None, event.get('attendees') or ())))
+        key = f"{event['summary']}|{event['start']}|{event['end']}|{attendees}"
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
     
     def sync_calendars(self, source_calendar_id: str, target_calendar_ids: List[str]) -> Dict[str, Any]:
         """Sync events from source calendar to target calendars"""
         try:
-            # Get events from source calendar
-            source_events = self.calendar_manager.get_events(calendar_id=source_calendar_id)
+            # Only events changed since the last sync of this source are copied
+            next_token, changes, _ = self.calendar_manager.list_event_changes(
+                source_calendar_id, self._sync_tokens.get(source_calendar_id)
+            )
+            
+            default_tz = self.calendar_manager.default_timezone
+            
+            pending = self._pending.setdefault(source_calendar_id, {})
+            for item in changes:
+                if item.get('status') == 'cancelled':
+                    pending.pop(item['id'], None)
+                else:
+                    pending[item['id']] = self.calendar_manager._parse_event(item)
+            
+            # Same window the full listing used: the next 30 days. Bounds are
+            # parsed once here and reused for the copies below
+            window_start = datetime.now(default_tz)
+            window_end = window_start + timedelta(days=30)
+            source_events = []
+            for event_id, event in list(pending.items()):
+                start_dt, end_dt = _event_bounds(event, default_tz)
+                if end_dt <= window_start:
+                    # Over before it was ever copied; nothing left to sync
+                    del pending[event_id]
+                elif start_dt < window_end:
+                    source_events.append((event, start_dt, end_dt))
             
             sync_results = {
                 'success': True,
                 'source_calendar': source_calendar_id,
                 'target_calendars': target_calendar_ids,
                 'synced_events': 0,
+                'skipped_events': 0,
                 'errors': []
             }
             
-            for event in source_events:
-                # Parse event times and ensure timezone awareness
-                start_str = event['start']
-                end_str = event['end']
-                
-                # Handle both date-only and datetime events
-                if 'T' in start_str:
-                    start_dt = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                    end_dt = datetime.fromisoformat(end_str.replace('Z', '+00:00'))
-                    
-                    # Convert to local timezone if needed
-                    if start_dt.tzinfo is None:
-                        start_dt = self.calendar_manager.default_timezone.localize(start_dt)
-                    if end_dt.tzinfo is None:
-                        end_dt = self.calendar_manager.default_timezone.localize(end_dt)
-                else:
-                    # All-day events
-                    start_dt = datetime.strptime(start_str, '%Y-%m-%d')
-                    start_dt = self.calendar_manager.default_timezone.localize(start_dt)
-                    end_dt = datetime.strptime(end_str, '%Y-%m-%d')
-                    end_dt = self.calendar_manager.default_timezone.localize(end_dt)
+            # Build every (event, target) copy first, then insert them in batches.
+            # Copies already made by an earlier run are skipped
+            copies = []
+            sources = []
+            hashes = []
+            for event, start_dt, end_dt in source_events:
+                content_hash = self._content_hash(event)
+                targets = [
+                    target_id for target_id in target_calendar_ids
+                    if content_hash not in self._synced.get(target_id, ())
+                ]
+                sync_results['skipped_events'] += len(target_calendar_ids) - len(targets)
+                if not targets:
+                    continue
                 
                 # Create event object
                 calendar_event = CalendarEvent(
@@ -843,15 +1343,29 @@ class CalendarSync:
                 )
                 
                 # Sync to each target calendar
-                for target_id in target_calendar_ids:
-                    calendar_event.calendar_id = target_id
-                    event_id = self.calendar_manager.create_event(calendar_event)
-                    
-                    if event_id:
-                        sync_results['synced_events'] += 1
-                    else:
-                        sync_results['errors'].append(f"Failed to sync event '{event['summary']}' to {target_id}")
+                for target_id in targets:
+                    copies.append(dataclasses.replace(calendar_event, calendar_id=target_id))
+                    sources.append(event['summary'])
+                    hashes.append(content_hash)
             
+            event_ids = self.calendar_manager.create_events_batch(copies) if copies else []
+            
+            for calendar_event, summary, content_hash, event_id in zip(copies, sources, hashes, event_ids):
+                if event_id:
+                    sync_results['synced_events'] += 1
+                    self._synced.setdefault(calendar_event.calendar_id, {})[content_hash] = event_id
+                else:
+                    sync_results['errors'].append(f"Failed to sync event '{summary}' to {calendar_event.calendar_id}")
+            
+            # Events copied to every target are done; failed copies stay
+            # pending and are retried next run
+            for event, _, _ in source_events:
+                content_hash = self._content_hash(event)
+                if all(content_hash in self._synced.get(target_id, ()) for target_id in target_calendar_ids):
+                    pending.pop(event['id'], None)
+            
+            if next_token:
+                self._sync_tokens[source_calendar_id] = next_token
             return sync_results
             
         except Exception as e:
@@ -868,47 +1382,51 @@ class TimeZoneHandler:
     def convert_to_timezone(dt: datetime, target_timezone: str) -> datetime:
         """Convert datetime to target timezone"""
         if dt.tzinfo is None:
-            dt = pytz.UTC.localize(dt)
+            dt = dt.replace(tzinfo=timezone.utc)
         
-        target_tz = pytz.timezone(target_timezone)
+        target_tz = _tz(target_timezone)
         return dt.astimezone(target_tz)
     
     @staticmethod
     def find_optimal_meeting_time(participant_timezones: List[str], 
                                  working_hours: Tuple[int, int] = (9, 17)) -> List[Dict]:
         """Find optimal meeting times across multiple time zones"""
+        # Each zone's current UTC offset in minutes, looked up once rather
+        # than building a datetime per zone per hour
+        now = datetime.now(timezone.utc)
+        offsets = [int(now.astimezone(_tz(tz_name)).utcoffset().total_seconds()) // 60
+                   for tz_name in participant_timezones]
+        work_start, work_end = working_hours[0] * 60, working_hours[1] * 60
+        # Participants in the same zone (or zones sharing an offset) only
+        # need checking once
+        distinct_offsets = set(offsets)
+        
         optimal_times = []
         
-        # Check each hour of the day
+        # Check each UTC hour of the day, stopping once the top 5 are found
         for hour in range(24):
-            suitable_for_all = True
-            time_info = []
+            hour_minutes = hour * 60
+            if not all(work_start <= (hour_minutes + offset) % 1440 < work_end
+                       for offset in distinct_offsets):
+                continue
+            local_minutes = [(hour_minutes + offset) % 1440 for offset in offsets]
             
-            for tz_name in participant_timezones:
-                tz = pytz.timezone(tz_name)
-                local_time = datetime.now(tz).replace(hour=hour, minute=0, second=0, microsecond=0)
-                
-                # Check if within working hours
-                if not (working_hours[0] <= local_time.hour < working_hours[1]):
-                    suitable_for_all = False
-                
-                time_info.append({
-                    'timezone': tz_name,
-                    'local_time': local_time.strftime('%H:%M'),
-                    'suitable': working_hours[0] <= local_time.hour < working_hours[1]
-                })
+            # Per-zone detail is only built for hours that are kept
+            time_info = [{
+                'timezone': tz_name,
+                'local_time': f"{minutes // 60:02d}:{minutes % 60:02d}",
+                'suitable': True
+            } for tz_name, minutes in zip(participant_timezones, local_minutes)]
             
-            if suitable_for_all:
-                optimal_times.append({
-                    'utc_hour': hour,
-                    'timezone_info': time_info,
-                    'suitability_score': sum(1 for info in time_info if info['suitable'])
-                })
-        
-        # Sort by suitability score
-        optimal_times.sort(key=lambda x: x['suitability_score'], reverse=True)
+            optimal_times.append({
+                'utc_hour': hour,
+                'timezone_info': time_info,
+                'suitability_score': len(time_info)
+            })
+            if len(optimal_times) == 5:
+                break
         
-        return optimal_times[:5]  # Return top 5 optimal times
+        return optimal_times
 
 class RecurringEventManager:
     """Advanced recurring event management"""
@@ -955,15 +1473,27 @@ class RecurringEventManager:
         return True
 
 
+def _start_log_listener() -> QueueListener:
+    """Route log records through a queue so callers only enqueue; a background thread writes them"""
+    queue: SimpleQueue = SimpleQueue()
+    listener = QueueListener(queue, logging.StreamHandler())
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(queue))
+    root.setLevel(logging.INFO)
+    listener.start()
+    return listener
+
+
 def main():
     """Example usage of the calendar system"""
+    listener = _start_log_listener()
     try:
         # Initialize calendar manager
         calendar_manager = GoogleCalendarManager()
         
         # Authenticate with Google Calendar
         if not calendar_manager.authenticate():
-            print("❌ Failed to authenticate with Google Calendar")
+            logger.error("Failed to authenticate with Google Calendar")
             return
         
         # Initialize scheduler
@@ -972,9 +1502,9 @@ def main():
         # Initialize AI assistant
         try:
             ai_assistant = AICalendarAssistant(calendar_manager, scheduler)
-            print("✅ AI Calendar Assistant initialized successfully")
+            logger.info("AI Calendar Assistant initialized successfully")
         except ValueError as e:
-            print(f"⚠️ AI Assistant not available: {e}")
+            logger.warning("AI Assistant not available: %s", e)
             ai_assistant = None
         
         # Example: Create a simple event
@@ -990,15 +1520,17 @@ def main():
         # Create the event
         event_id = calendar_manager.create_event(event)
         if event_id:
-            print(f"✅ Test event created with ID: {event_id}")
+            logger.info("Test event created with ID: %s", event_id)
         
         # Example: Use AI assistant if available
         if ai_assistant:
             result = ai_assistant.execute_command("Find free time for 1 hour meeting tomorrow")
-            print(f"🤖 AI Response: {result}")
+            logger.info("AI Response: %s", result)
         
     except Exception as e:
-        print(f"❌ Error in main: {e}")
+        logger.error("Error in main: %s", e)
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,19 @@
 import os
-import json
+import re
+import asyncio
 import logging
+from contextlib import aclosing, closing
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import orjson
 from dotenv import load_dotenv
 from langchain.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
+from app.repositories._classify_cache import LLMCache
 
 # Load environment variables
-load_dotenv()
+if os.environ.get("ZENTAR_LOAD_DOTENV", "1") == "1":
+    load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 # Simple logger setup
@@ -22,53 +29,9 @@ def get_logger(name: str):
 
 logger = get_logger(__name__)
 
-def clean_text(text: str) -> str:
-    """Clean and format text output from AI models."""
-    if not text:
-        return ""
-    
-    # First, try to extract JSON from markdown code blocks
-    import re
-    json_match = re.search(r'```json\s*(\{.*?\})\s*```', text, re.DOTALL)
-    if json_match:
-        text = json_match.group(1)
-    else:
-        # Remove markdown code blocks if no JSON found
-        text = text.replace('```json', '').replace('```', '')
-        
-        # Try to extract JSON if it's wrapped in other text
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            text = json_match.group(0)
-    
-    # Remove leading/trailing whitespace and newlines
-    text = text.strip()
-    
-    # Remove any trailing commas and extra whitespace
-    text = re.sub(r',\s*}', '}', text)
-    text = re.sub(r',\s*]', ']', text)
-    
-    # Handle escaped characters
-    text = text.replace('\\n', '\n')
-    text = text.replace('\\t', '\t')
-    text = text.replace('\\"', '"')
-    text = text.replace('\\\\', '\\')
-    text = text.replace("\\'", "'")  # Handle escaped apostrophes
-    
-    return text
+_CATEGORIES = ("Urgent to Respond", "For Your Information", "Office Work", "Spam")
 
-def classify_email(subject:str,body:str) -> dict:
-    """
-    Classify email into one of four categories: Urgent to Respond, For Your Information, Office Work, or Spam.
-    """
-    prompt_template = PromptTemplate(
-        input_variables=["subject", "body"],
-        template=("""
-You are an AI Email Classifier.  
-
-Your task: Analyze the given email subject and body, then classify it into one of the following categories:  
-
-1. "Urgent to Respond"  
+_CATEGORY_GUIDE = """1. "Urgent to Respond"  
    - Time-sensitive emails requiring immediate reply or action  
    - Examples: deadlines, escalations, critical issues  
 
@@ -84,7 +47,16 @@ Your task: Analyze the given email subject and body, then classify it into one o
    - Unwanted, irrelevant, or promotional emails  
    - Examples: ads, phishing attempts, unrelated content  
 
-### Critical Instructions:
+"""
+
+_PROMPT_TEMPLATE = PromptTemplate(
+    input_variables=["subject", "body"],
+    template=("""
+You are an AI Email Classifier.  
+
+Your task: Analyze the given email subject and body, then classify it into one of the following categories:  
+
+""" + _CATEGORY_GUIDE + """### Critical Instructions:
 - Always classify into exactly **one** of the four categories above.  
 - Output must be in **strict JSON** format only.  
 - JSON must contain exactly one key `"output"` with the classification string as the value.  
@@ -118,73 +90,287 @@ Subject: {subject}
 Body: {body}  
 
 """
-        )
     )
+)
 
-    prompt = prompt_template.format(
-        subject=subject,
-        body=body
-    )
-
-    # Initialize Gemini model
-    model = ChatGoogleGenerativeAI(
+@lru_cache(maxsize=1)
+def _get_model() -> ChatGoogleGenerativeAI:
+    """Shared Gemini client, created on first use so imports work without a key"""
+    return ChatGoogleGenerativeAI(
         model="gemini-2.5-flash",
         temperature=0.2,
         google_api_key=GEMINI_API_KEY
     )
 
-    raw_output = model.invoke(prompt)
+# Trailing commas are the one defect worth repairing in a model reply
+_TRAIL_COMMA_OBJ = re.compile(r',\s*}')
+_TRAIL_COMMA_ARR = re.compile(r',\s*]')
+
+# Rules for mail that is obviously spam or bulk FYI, checked before the model.
+# Matches are case-insensitive and whole-word.
+_SPAM_SUBJECT_RE = re.compile(
+    r"\b(?:viagra|crypto|lottery|bitcoin|you have won|you've won|casino|claim your prize)\b",
+    re.IGNORECASE
+)
+_UNSUBSCRIBE_RE = re.compile(r"\bunsubscribe\b", re.IGNORECASE)
+_VIEW_IN_BROWSER_RE = re.compile(r"\bview (?:it |this email )?in (?:your |a )?browser\b", re.IGNORECASE)
+
+# Results for repeated (subject, body) pairs, e.g. newsletters and notifications
+_cache = LLMCache()
 
-    logger.debug("Raw model output: %s", raw_output)
+# Upper bound on concurrent Gemini requests from the async path
+_MAX_CONCURRENT_CALLS = 20
+
+def extract_json(text: str) -> str:
+    """Return the first balanced JSON object in a model reply.
+
+    One left-to-right pass: find the first '{' (which also skips any
+    ```json fence) and track brace depth, ignoring braces inside string
+    literals. Text without an object is returned stripped.
+    """
+    if not text:
+        return ""
+
+    start = text.find("{")
+    if start == -1:
+        return text.strip()
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+
+    # Unbalanced (e.g. truncated reply); hand back what there is
+    return text[start:].strip()
+
+def _rule_based_label(subject: str, body: str) -> Optional[str]:
+    """Category for mail the rules recognise without the model, else None"""
+    if subject and _SPAM_SUBJECT_RE.search(subject):
+        return "Spam"
+    if body and _UNSUBSCRIBE_RE.search(body) and _VIEW_IN_BROWSER_RE.search(body):
+        return "For Your Information"
+    return None
+
+def _known_result(subject: str, body: str) -> Optional[dict]:
+    """Result available without calling Gemini: a rule match or a cache hit"""
+    label = _rule_based_label(subject, body)
+    if label is not None:
+        return {"output": label}
+    return _cache.get(_cache.key(subject, body))
+
+def classify_email(subject:str,body:str) -> dict:
+    """
+    Classify email into one of four categories: Urgent to Respond, For Your Information, Office Work, or Spam.
+    """
+    known = _known_result(subject, body)
+    if known is not None:
+        return known
 
-    # Extract text only
-    text_output = str(raw_output)
+    result = _classify_uncached(subject, body)
+    if "output" in result:
+        _cache.set(_cache.key(subject, body), result)
+    return result
 
-    # Clean and parse JSON
-    cleaned = clean_text(text_output)
+async def classify_email_async(subject: str, body: str) -> dict:
+    """
+    Async variant of classify_email; awaits Gemini instead of blocking a worker thread.
+    """
+    known = _known_result(subject, body)
+    if known is not None:
+        return known
+
+    prompt = _PROMPT_TEMPLATE.format(subject=subject, body=body)
+    chunks: List[str] = []
+    async with aclosing(_get_model().astream(prompt)) as stream:
+        async for chunk in stream:
+            chunks.append(chunk.content)
+            result = _completed_object(chunks, chunk.content)
+            if result is not None:
+                break
+        else:
+            result = _parse_classification("".join(chunks))
+    if "output" in result:
+        _cache.set(_cache.key(subject, body), result)
+    return result
+
+def classify_emails_batch(items: List[Tuple[str, str]]) -> List[dict]:
+    """
+    Classify several (subject, body) pairs with one Gemini call.
+
+    Results come back in input order, shaped like classify_email's. Items a
+    rule or the cache already answers are not sent, and any item the batch reply does not cover is
+    retried through classify_email on its own.
+    """
+    results: List[Optional[dict]] = []
+    pending: List[int] = []
+    for index, (subject, body) in enumerate(items):
+        known = _known_result(subject, body)
+        results.append(known)
+        if known is None:
+            pending.append(index)
+
+    if len(pending) == 1:
+        results[pending[0]] = classify_email(*items[pending[0]])
+    elif pending:
+        labels = _classify_batch_uncached([items[index] for index in pending])
+        for index, label in zip(pending, labels):
+            if label in _CATEGORIES:
+                results[index] = {"output": label}
+                _cache.set(_cache.key(*items[index]), results[index])
+            else:
+                results[index] = classify_email(*items[index])
+
+    return results
+
+async def classify_emails_batch_async(items: List[Tuple[str, str]]) -> List[dict]:
+    """
+    Async variant of classify_emails_batch.
+
+    Items the batch reply does not cover are retried concurrently, at most
+    _MAX_CONCURRENT_CALLS at a time to stay inside Gemini rate limits. A
+    failed retry yields {"error": ...} for that item only.
+    """
+    results: List[Optional[dict]] = []
+    pending: List[int] = []
+    for index, (subject, body) in enumerate(items):
+        known = _known_result(subject, body)
+        results.append(known)
+        if known is None:
+            pending.append(index)
+
+    if len(pending) > 1:
+        try:
+            raw_output = await _get_model().ainvoke(_build_batch_prompt([items[index] for index in pending]))
+            labels = _parse_batch_labels(raw_output, len(pending))
+        except Exception as e:
+            logger.error("Batch classification failed: %s", e)
+            labels = [None] * len(pending)
+
+        retry: List[int] = []
+        for index, label in zip(pending, labels):
+            if label in _CATEGORIES:
+                results[index] = {"output": label}
+                _cache.set(_cache.key(*items[index]), results[index])
+            else:
+                retry.append(index)
+        pending = retry
+
+    if pending:
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CALLS)
+
+        async def classify_one(index: int) -> dict:
+            async with semaphore:
+                return await classify_email_async(*items[index])
+
+        outcomes = await asyncio.gather(*(classify_one(index) for index in pending), return_exceptions=True)
+        for index, outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Classification failed: %s", outcome)
+                outcome = {"error": str(outcome)}
+            results[index] = outcome
+
+    return results
+
+def _build_batch_prompt(items: List[Tuple[str, str]]) -> str:
+    emails = "\n---\n".join(
+        f"[{index}] Subject: {subject}\nBody: {body[:2000]}"
+        for index, (subject, body) in enumerate(items)
+    )
+    return f"""
+You are an AI Email Classifier.  
+
+Your task: Classify each of the following {len(items)} emails into one of these categories:  
+
+{_CATEGORY_GUIDE}### Critical Instructions:
+- Classify every email into exactly **one** of the four categories above.  
+- Output must be in **strict JSON** format only: {{"outputs": ["...", "..."]}}  
+- `"outputs"` must list one category string per email, in the same order as the input.  
+- Do not add explanations or extra text.  
+
+### Emails:
+{emails}
+"""
+
+def _parse_batch_labels(raw_output, count: int) -> List[Optional[str]]:
+    outputs = orjson.loads(extract_json(raw_output.content)).get("outputs", [])
+    if len(outputs) != count:
+        logger.warning("Batch classification returned %s labels for %s emails", len(outputs), count)
+        return [None] * count
+    return outputs
+
+def _classify_batch_uncached(items: List[Tuple[str, str]]) -> List[Optional[str]]:
+    try:
+        raw_output = _get_model().invoke(_build_batch_prompt(items))
+        return _parse_batch_labels(raw_output, len(items))
+    except Exception as e:
+        logger.error("Batch classification failed: %s", e)
+        return [None] * len(items)
+
+def _classify_uncached(subject: str, body: str) -> dict:
+    prompt = _PROMPT_TEMPLATE.format(
+        subject=subject,
+        body=body
+    )
+
+    # Stream the reply and stop reading once the JSON object has closed;
+    # anything the model appends after it is never waited for
+    chunks: List[str] = []
+    with closing(_get_model().stream(prompt)) as stream:
+        for chunk in stream:
+            chunks.append(chunk.content)
+            result = _completed_object(chunks, chunk.content)
+            if result is not None:
+                return result
+    return _parse_classification("".join(chunks))
+
+def _completed_object(chunks: List[str], latest: str) -> Optional[dict]:
+    """Parsed reply once the streamed text holds a complete JSON object, else None"""
+    if "}" not in latest:
+        return None
+    try:
+        result = orjson.loads(extract_json("".join(chunks)))
+    except orjson.JSONDecodeError:
+        return None
+    return result if isinstance(result, dict) else None
+
+def _parse_classification(text: str) -> dict:
+    logger.debug("Raw model output: %s", text)
+
+    # Pull the JSON object out of the reply text
+    cleaned = extract_json(text)
     
     # Try to parse the cleaned JSON
     try:
-        parsed_json = json.loads(cleaned)
+        parsed_json = orjson.loads(cleaned)
         logger.info("Successfully parsed JSON")
         return parsed_json
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON: {e}")
-        
-        # Try to extract JSON from the raw output more aggressively
-        import re
-        
-        # First, try to extract the content from the Gemini response
-        content_match = re.search(r"content='(.*?)'", text_output, re.DOTALL)
-        if content_match:
-            content = content_match.group(1)
-            # Look for JSON between ```json and ``` markers
-            json_match = re.search(r'```json\s*(\{.*?\})\s*```', content, re.DOTALL)
-            if json_match:
-                try:
-                    extracted_json = json_match.group(1)
-                    # Clean the extracted JSON
-                    extracted_json = extracted_json.replace('\\n', '\n').replace('\\"', '"').replace('\\\\', '\\').replace("\\'", "'")
-                    # Remove trailing commas
-                    extracted_json = re.sub(r',\s*}', '}', extracted_json)
-                    extracted_json = re.sub(r',\s*]', ']', extracted_json)
-                    return json.loads(extracted_json)
-                except json.JSONDecodeError:
-                    pass
-        
-        # Try to find just the JSON object without extra metadata
-        json_match = re.search(r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})', text_output, re.DOTALL)
-        if json_match:
-            try:
-                extracted_json = json_match.group(1)
-                # Clean the extracted JSON
-                extracted_json = extracted_json.replace('\\n', '\n').replace('\\"', '"').replace('\\\\', '\\').replace("\\'", "'")
-                # Remove trailing commas
-                extracted_json = re.sub(r',\s*}', '}', extracted_json)
-                extracted_json = re.sub(r',\s*]', ']', extracted_json)
-                return json.loads(extracted_json)
-            except json.JSONDecodeError:
-                pass
-        
-        # If all else fails, return the raw output
-        return {"raw_output": cleaned, "error": "Failed to parse JSON"}
+    except orjson.JSONDecodeError as e:
+        logger.error("Failed to parse JSON: %s", e)
+
+    # extract_json has already isolated the object, so at most one more
+    # parse, and only when stripping trailing commas changed something
+    repaired = _TRAIL_COMMA_ARR.sub(']', _TRAIL_COMMA_OBJ.sub('}', cleaned))
+    if repaired != cleaned:
+        try:
+            return orjson.loads(repaired)
+        except orjson.JSONDecodeError:
+            pass
+
+    # If all else fails, return the raw output
+    return {"raw_output": cleaned, "error": "Failed to parse JSON"}
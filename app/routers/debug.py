@@ -0,0 +1,44 @@
+import logging
+from fastapi import APIRouter
+from app.config import settings
+from app.database import get_client
+from app.models.user import User
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+@router.get("/db")
+async def debug_database():
+    """Debug endpoint to test database connection"""
+    try:
+        logging.info("Testing database connection...")
+        
+        # Test if we can connect to MongoDB
+        await get_client().admin.command('ping')
+        
+        # Test if we can query users (reads collection metadata, no scan)
+        user_count = await User.get_motor_collection().estimated_document_count()
+        
+        return {
+            "status": "success",
+            "mongodb_connection": "OK",
+            "database_name": settings.DATABASE_NAME,
+            "user_count": user_count,
+            "message": "Database connection and query successful"
+        }
+    except Exception as e:
+        logging.error("Database debug failed: %s", e)
+        return {
+            "status": "error",
+            "error": str(e),
+            "error_type": type(e).__name__,
+            "message": "Database connection or query failed"
+        }
+
+@router.get("/test")
+async def debug_test():
+    """Simple test endpoint without authentication"""
+    return {
+        "status": "success",
+        "message": "Basic endpoint working",
+        "timestamp": "2024-01-01T00:00:00Z"
+    }
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from app.services.email_service import EmailService
 from app.auth.jwt import get_current_user
@@ -65,7 +67,18 @@ async def get_thread_emails(
     current_user: User = Depends(get_current_user)
 ):
     """Get all emails in a thread"""
-    return await EmailService.get_thread_emails(thread_id, str(current_user.id))
+    emails = await EmailService.get_thread_emails(thread_id, str(current_user.id))
+    return Response(content=msgspec.json.encode(emails), media_type="application/json")
+
+@router.get("/export")
+async def export_emails(
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every received email as newline-delimited JSON"""
+    return StreamingResponse(
+        EmailService.stream_received_emails(str(current_user.id)),
+        media_type="application/x-ndjson"
+    )
 
 @router.post("/send", response_model=EmailResponse, status_code=status.HTTP_201_CREATED)
 async def send_email(
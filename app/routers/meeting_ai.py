@@ -1,9 +1,14 @@
+import asyncio
+from functools import lru_cache
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Dict, Any, Optional
 from datetime import datetime
 from pydantic import BaseModel
-from app.services.meeting_service import MeetingService
+from app.services.meeting_service import (
+    CalendarEvent, MeetingService, format_clock, format_slot_start, get_meeting_service_async
+)
 from app.auth.jwt import get_current_user
+from app.config import settings
 from app.models.user import User
 
 router = APIRouter(prefix="/meetings/ai", tags=["AI Meeting Management"])
@@ -100,7 +105,7 @@ async def get_calendar_status(
     Get the status of Google Calendar integration
     """
     try:
-        service = MeetingService()
+        service = await get_meeting_service_async()
         calendar_connected = service.calendar_manager.service is not None
         ai_configured = service.ai_assistant.model is not None
         
@@ -126,11 +131,14 @@ async def suggest_alternative_times(
     Get alternative meeting times when conflicts are detected
     """
     try:
-        # Get the meeting details
-        meeting = await MeetingService.get_meeting(meeting_id, str(current_user.id))
+        # Get the meeting details while the service is built (first call
+        # authenticates with Google, which blocks)
+        meeting, service = await asyncio.gather(
+            MeetingService.get_meeting(meeting_id, str(current_user.id)),
+            get_meeting_service_async()
+        )
         
         # Create calendar event for conflict detection
-        from app.services.meeting_service import CalendarEvent
         calendar_event = CalendarEvent(
             summary=meeting.title,
             description=meeting.description,
@@ -139,17 +147,16 @@ async def suggest_alternative_times(
             timezone="UTC"
         )
         
-        # Get service instance and suggest alternatives
-        service = MeetingService()
-        alternatives = service.scheduler.suggest_alternatives(calendar_event)
+        # Suggest alternatives
+        alternatives = await asyncio.to_thread(service.scheduler.suggest_alternatives, calendar_event)
         
         formatted_alternatives = []
         for alt in alternatives:
             formatted_alternatives.append({
                 "start": alt.start_datetime.isoformat(),
                 "end": alt.end_datetime.isoformat(),
-                "start_formatted": alt.start_datetime.strftime('%A, %B %d at %I:%M %p'),
-                "end_formatted": alt.end_datetime.strftime('%I:%M %p'),
+                "start_formatted": format_slot_start(alt.start_datetime),
+                "end_formatted": format_clock(alt.end_datetime),
                 "title": alt.summary,
                 "description": alt.description
             })
@@ -171,6 +178,16 @@ async def suggest_alternative_times(
             detail=str(e)
         )
 
+@lru_cache
+def _working_hours_config() -> Dict[str, Any]:
+    """Scheduler configuration; SmartScheduler takes these straight from settings,
+    so there is no need to build (and authenticate) the MeetingService"""
+    return {
+        "working_hours": settings.DEFAULT_WORKING_HOURS,
+        "buffer_time_minutes": settings.BUFFER_TIME_BETWEEN_MEETINGS,
+        "timezone": settings.DEFAULT_TIMEZONE
+    }
+
 @router.get("/working-hours")
 async def get_working_hours(
     current_user: User = Depends(get_current_user)
@@ -179,12 +196,7 @@ async def get_working_hours(
     Get current working hours configuration
     """
     try:
-        service = MeetingService()
-        return {
-            "working_hours": service.scheduler.working_hours,
-            "buffer_time_minutes": service.scheduler.break_duration,
-            "timezone": service.calendar_manager.default_timezone.zone
-        }
+        return dict(_working_hours_config())
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status
 from typing import Dict
 from app.models.user import User
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, UserUpdate
 from app.services.auth_service import AuthService
 from app.auth.jwt import get_current_user
 
@@ -18,6 +18,5 @@ async def update_settings(
     current_user: User = Depends(get_current_user)
 ):
     """Update user settings"""
-    from app.schemas.user import UserUpdate
     user_data = UserUpdate(settings=settings)
     return await AuthService.update_user_profile(str(current_user.id), user_data)
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 from typing import List, Optional
-from bson import ObjectId
+import msgspec
 
 class EmailBase(BaseModel):
     subject: str = Field(..., min_length=1, max_length=200)
@@ -20,13 +20,36 @@ class EmailResponse(EmailBase):
     isDeleted: bool
     sentAt: datetime
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_encoders={
-            datetime: lambda v: v.isoformat(),
-            ObjectId: str
-        }
-    )
+    model_config = ConfigDict(from_attributes=True)
+
+class EmailOut(msgspec.Struct):
+    """msgspec mirror of EmailResponse for list endpoints that bypass pydantic"""
+    id: str
+    from_user: str
+    to_users: List[str]
+    subject: str
+    body: str
+    threadId: str
+    isRead: bool
+    isDeleted: bool
+    sentAt: datetime
+    attachments: List[str]
+
+    @classmethod
+    def from_document(cls, doc: dict) -> "EmailOut":
+        """Build from a raw Mongo document (aliased keys, ObjectId values)"""
+        return cls(
+            id=str(doc["_id"]),
+            from_user=str(doc["from"]),
+            to_users=list(map(str, doc["to"])),
+            subject=doc["subject"],
+            body=doc["body"],
+            threadId=str(doc["threadId"]),
+            isRead=doc.get("isRead", False),
+            isDeleted=doc.get("isDeleted", False),
+            sentAt=doc["sentAt"],
+            attachments=doc.get("attachments", [])
+        )
 
 class EmailUpdate(BaseModel):
     isRead: Optional[bool] = None
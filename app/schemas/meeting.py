@@ -1,7 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 from typing import List, Optional
-from bson import ObjectId
 
 class MeetingBase(BaseModel):
     participants: List[str] = Field(..., min_items=1, description="List of participant user IDs or email addresses")
@@ -27,13 +26,7 @@ class MeetingResponse(MeetingBase):
     status: str
     createdAt: datetime
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_encoders={
-            datetime: lambda v: v.isoformat(),
-            ObjectId: str
-        }
-    )
+    model_config = ConfigDict(from_attributes=True)
 
 class MeetingListResponse(BaseModel):
     meetings: List[MeetingResponse]
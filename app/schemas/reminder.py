@@ -1,6 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from bson import ObjectId
 from typing import List
 
 class ReminderBase(BaseModel):
@@ -15,13 +14,7 @@ class ReminderResponse(ReminderBase):
     userId: str
     createdAt: datetime
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_encoders={
-            datetime: lambda v: v.isoformat(),
-            ObjectId: str
-        }
-    )
+    model_config = ConfigDict(from_attributes=True)
 
 class ReminderListResponse(BaseModel):
     reminders: List[ReminderResponse]
@@ -1,10 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
-from app.auth.jwt import get_password_hash, verify_password, create_access_token
+from app.auth.jwt import hash_password, verify_password_async, create_access_token
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 class AuthService:
     @staticmethod
@@ -19,7 +20,7 @@ class AuthService:
             )
         
         # Hash password and create user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         user = User(
             name=user_data.name,
             email=user_data.email,
@@ -46,7 +47,7 @@ class AuthService:
         if not user:
             return None
         
-        if not verify_password(password, user.password):
+        if not await verify_password_async(password, user.password):
             return None
         
         return user
@@ -108,13 +109,6 @@ class AuthService:
     async def update_user_profile(user_id: str, user_data: UserUpdate) -> UserResponse:
         """Update user profile"""
         try:
-            user = await User.get(ObjectId(user_id))
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found"
-                )
-            
             # Update fields if provided
             update_data = {}
             if user_data.name is not None:
@@ -124,20 +118,28 @@ class AuthService:
             if user_data.settings is not None:
                 update_data["settings"] = user_data.settings
             
-            update_data["updatedAt"] = datetime.utcnow()
+            update_data["updatedAt"] = datetime.now(timezone.utc)
             
-            await user.update({"$set": update_data})
+            # Update and read back the new document in one round trip
+            updated_user = await User.get_motor_collection().find_one_and_update(
+                {"_id": ObjectId(user_id)},
+                {"$set": update_data},
+                return_document=ReturnDocument.AFTER
+            )
+            if updated_user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found"
+                )
             
-            # Get updated user
-            updated_user = await User.get(ObjectId(user_id))
             return UserResponse(
-                id=str(updated_user.id),
-                name=updated_user.name,
-                email=updated_user.email,
-                avatar=updated_user.avatar,
-                settings=updated_user.settings,
-                createdAt=updated_user.createdAt,
-                updatedAt=updated_user.updatedAt
+                id=str(updated_user["_id"]),
+                name=updated_user["name"],
+                email=updated_user["email"],
+                avatar=updated_user.get("avatar"),
+                settings=updated_user.get("settings", {}),
+                createdAt=updated_user["createdAt"],
+                updatedAt=updated_user["updatedAt"]
             )
         except Exception:
             raise HTTPException(
@@ -1,4 +1,7 @@
 import os
+import asyncio
+import logging
+import threading
 import smtplib
 import imaplib
 import email
@@ -8,29 +11,100 @@ from email.mime.base import MIMEBase
 from email import encoders
 from email.header import decode_header
 from email.utils import parsedate_to_datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
+import msgspec
+from cachetools import TTLCache
 from datetime import datetime, timezone
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
-from app.repositories.email_classification import classify_email
+from app.repositories.email_classification import classify_emails_batch_async
 from fastapi import HTTPException, status
 from bson import ObjectId
+from pymongo import ReturnDocument
 from app.models.email import Email
 from app.models.user import User
 from app.models.thread import Thread
-from app.schemas.email import EmailCreate, EmailResponse, EmailListResponse
+from app.schemas.email import EmailCreate, EmailResponse, EmailListResponse, EmailOut
 from app.config import settings
 
+def _send_via_smtp(msg: MIMEMultipart) -> None:
+    """Deliver a message over SMTP; blocking, so callers run it in a worker thread"""
+    if settings.SMTP_USE_TLS:
+        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
+        server.starttls()
+    else:
+        server = smtplib.SMTP_SSL(settings.SMTP_SERVER, settings.SMTP_PORT)
+    
+    server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+    server.send_message(msg)
+    server.quit()
+
+async def _email_access_error(email_id: str) -> HTTPException:
+    """404 or 403 for an email a guarded update did not match"""
+    if await Email.get_motor_collection().count_documents({"_id": ObjectId(email_id)}, limit=1):
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this email"
+        )
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Email not found"
+    )
+
+# One logged-in IMAP connection per process, reused across requests so the
+# TLS handshake and LOGIN stay off the request path. imaplib connections
+# are not thread-safe, so every use holds the lock
+_imap_client: Optional[imaplib.IMAP4_SSL] = None
+_imap_lock = threading.Lock()
+
+# The inbox list only needs headers, the text part and attachment names, so
+# each message is fetched up to this many bytes rather than in full; large
+# attachments stay on the server
+_LIST_FETCH_BYTES = 256 * 1024
+
+def _imap_connection() -> imaplib.IMAP4_SSL:
+    """Shared IMAP connection, reconnecting if the server dropped it; caller holds _imap_lock"""
+    global _imap_client
+    if _imap_client is not None:
+        try:
+            _imap_client.noop()
+            return _imap_client
+        except (imaplib.IMAP4.error, OSError):
+            _drop_imap_connection()
+
+    client = imaplib.IMAP4_SSL(settings.IMAP_SERVER)
+    client.login(settings.IMAP_USERNAME, settings.IMAP_PASSWORD)
+    _imap_client = client
+    return client
+
+def _drop_imap_connection() -> None:
+    """Forget the shared connection, logging out if it still answers; caller holds _imap_lock"""
+    global _imap_client
+    client, _imap_client = _imap_client, None
+    if client is not None:
+        try:
+            client.logout()
+        except (imaplib.IMAP4.error, OSError):
+            pass
+
+def close_imap_connection() -> None:
+    """Log out of the shared IMAP connection (application shutdown)"""
+    with _imap_lock:
+        _drop_imap_connection()
+
 def fetch_latest_10_emails():
+    with _imap_lock:
+        return _fetch_latest_10_emails()
+
+def _fetch_latest_10_emails():
     try:
         # Check if IMAP settings are configured
         if not settings.IMAP_SERVER or not settings.IMAP_USERNAME or not settings.IMAP_PASSWORD:
             print("IMAP settings not configured, returning empty list")
             return []
             
-        # Connect to IMAP server
-        mail = imaplib.IMAP4_SSL(settings.IMAP_SERVER)
-        mail.login(settings.IMAP_USERNAME, settings.IMAP_PASSWORD)
+        # Reuse the logged-in connection
+        mail = _imap_connection()
 
         # Select inbox
         mail.select("inbox")
@@ -43,9 +117,18 @@ def fetch_latest_10_emails():
         latest_ids = email_ids[-10:]
 
         emails = []
+        if not latest_ids:
+            return emails
+
+        # Fetch all of them in one command; BODY.PEEK leaves \Seen alone.
+        # Message parts come back as (b"<num> (BODY[]<0> {size}", raw) tuples
+        status, data = mail.fetch(b",".join(latest_ids), f"(BODY.PEEK[]<0.{_LIST_FETCH_BYTES}>)")
+        raw_by_num = {part[0].split(None, 1)[0]: part[1] for part in data if isinstance(part, tuple)}
+
         for num in reversed(latest_ids):
-            status, data = mail.fetch(num, "(RFC822)")
-            raw_email = data[0][1]
+            raw_email = raw_by_num.get(num)
+            if raw_email is None:
+                continue
             msg = email.message_from_bytes(raw_email)
 
             # Decode subject
@@ -69,15 +152,14 @@ def fetch_latest_10_emails():
             if msg.is_multipart():
                 for part in msg.walk():
                     if part.get_content_type() == "text/plain":
-                        body = part.get_payload(decode=True).decode()
+                        body = part.get_payload(decode=True).decode(errors="replace")
                         break
             else:
-                body = msg.get_payload(decode=True).decode()
+                body = msg.get_payload(decode=True).decode(errors="replace")
 
             # Get date
             date_str = msg.get("Date", "")
             try:
-                from email.utils import parsedate_to_datetime
                 sent_at = parsedate_to_datetime(date_str)
             except:
                 sent_at = datetime.now()
@@ -92,7 +174,6 @@ def fetch_latest_10_emails():
                             filename = filename.decode()
                         attachments.append(filename)
 
-            category = classify_email(subject,body)
             emails.append({
                 "id": num.decode() if isinstance(num, bytes) else str(num),
                 "from_user": from_,
@@ -104,16 +185,44 @@ def fetch_latest_10_emails():
                 "isDeleted": False,
                 "sentAt": sent_at,
                 "attachments": attachments,
-                "category": category
+                "category": None
             })
 
 
-        mail.logout()
         return emails
     except Exception as e:
         print(f"Error fetching emails from IMAP: {str(e)}")
+        # The connection may be mid-response; start clean next time
+        _drop_imap_connection()
         return []
 
+# Classified latest emails per mailbox. The IMAP fetch plus Gemini
+# classification dominates GET /inbox, and refreshes within a few seconds
+# would repeat it verbatim. The lock makes concurrent misses share one fetch
+_INBOX_CACHE: TTLCache = TTLCache(maxsize=16, ttl=30)
+_inbox_lock = asyncio.Lock()
+
+async def fetch_and_classify_latest_emails():
+    """Latest inbox emails, classified; served from a 30 second cache when possible"""
+    async with _inbox_lock:
+        emails = _INBOX_CACHE.get(settings.IMAP_USERNAME)
+        if emails is None:
+            emails = await _fetch_and_classify_latest_emails()
+            # An empty list usually means the fetch failed; don't pin that
+            if emails:
+                _INBOX_CACHE[settings.IMAP_USERNAME] = emails
+    return emails
+
+async def _fetch_and_classify_latest_emails():
+    """Fetch the latest inbox emails off the event loop and classify them concurrently"""
+    emails = await asyncio.to_thread(fetch_latest_10_emails)
+
+    # One Gemini call for the whole page instead of one per email
+    categories = await classify_emails_batch_async([(e["subject"], e["body"]) for e in emails])
+    for e, category in zip(emails, categories):
+        e["category"] = category
+    return emails
+
 class EmailService:
     """Email service with AI-powered composition using Gemini"""
     
@@ -163,7 +272,7 @@ class EmailService:
             prompt = self._build_composition_prompt(context, tone, length, recipient_type, subject_line)
             
             # Generate email content using Gemini
-            response = self.model.generate_content(
+            response = await self.model.generate_content_async(
                 prompt,
                 safety_settings=self.safety_settings,
                 generation_config=genai.types.GenerationConfig(
@@ -329,7 +438,7 @@ class EmailService:
             prompt = self._build_template_prompt(template_type, context)
             
             # Generate email content
-            response = self.model.generate_content(
+            response = await self.model.generate_content_async(
                 prompt,
                 safety_settings=self.safety_settings,
                 generation_config=genai.types.GenerationConfig(
@@ -422,7 +531,7 @@ class EmailService:
             skip = (page - 1) * limit
             
             # Find emails where user is in the 'to' list and not deleted
-            emails = fetch_latest_10_emails()
+            emails = await fetch_and_classify_latest_emails()
             # Get total count from fetched emails
             total = len(emails)
             # Convert to response format
@@ -431,7 +540,7 @@ class EmailService:
                 email_responses.append(EmailResponse(
                     id=str(email["id"]),
                     from_user=str(email["from_user"]),
-                    to_users=[str(to_id) for to_id in email["to_users"]],
+                    to_users=list(map(str, email["to_users"])),
                     subject=email["subject"],
                     body=email["body"],
                     threadId=str(email["threadId"]),
@@ -448,10 +557,9 @@ class EmailService:
                 limit=limit
             )
         except Exception as e:
-            import logging
-            logging.error(f"Error fetching inbox emails for user {user_id}: {str(e)}")
-            logging.error(f"Exception type: {type(e).__name__}")
-            logging.error(f"Exception details: {e}")
+            logging.error("Error fetching inbox emails for user %s: %s", user_id, e)
+            logging.error("Exception type: %s", type(e).__name__)
+            logging.error("Exception details: %r", e)
             print(e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -459,78 +567,98 @@ class EmailService:
             )
 
     @staticmethod
-    async def get_thread_emails(thread_id: str, user_id: str) -> List[EmailResponse]:
+    async def get_thread_emails(thread_id: str, user_id: str) -> List[EmailOut]:
         """Get all emails in a thread"""
         try:
-            # Verify user has access to this thread
-            thread = await Thread.get(ObjectId(thread_id))
-            if not thread or ObjectId(user_id) not in thread.participants:
+            # Verify user has access to this thread; match on membership in
+            # Mongo so the thread's growing emails array is never loaded
+            thread = await Thread.get_motor_collection().find_one(
+                {"_id": ObjectId(thread_id), "participants": ObjectId(user_id)},
+                projection={"_id": 1}
+            )
+            if not thread:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Access denied to this thread"
                 )
             
-            # Get all emails in the thread
-            emails = await Email.find({"threadId": ObjectId(thread_id)}).sort([("sentAt", 1)]).to_list()
-            
-            email_responses = []
-            for email in emails:
-                email_responses.append(EmailResponse(
-                    id=str(email.id),
-                    from_user=str(email.from_user),
-                    to_users=[str(to_id) for to_id in email.to_users],
-                    subject=email.subject,
-                    body=email.body,
-                    threadId=str(email.threadId),
-                    isRead=email.isRead,
-                    isDeleted=email.isDeleted,
-                    sentAt=email.sentAt,
-                    attachments=email.attachments
-                ))
-            
-            return email_responses
+            # Get all emails in the thread straight from the raw cursor,
+            # skipping Document validation
+            cursor = Email.get_motor_collection().find({"threadId": ObjectId(thread_id)}).sort("sentAt", 1)
+            return [EmailOut.from_document(doc) async for doc in cursor]
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error fetching thread emails: {str(e)}"
             )
 
+    @staticmethod
+    async def stream_received_emails(user_id: str) -> AsyncIterator[bytes]:
+        """Yield the user's received emails, newest first, as NDJSON lines.
+
+        Rows are encoded as they come off the Mongo cursor, so memory stays
+        flat however many emails the user has.
+        """
+        cursor = Email.get_motor_collection().find(
+            {"to": ObjectId(user_id), "isDeleted": False}
+        ).sort("sentAt", -1)
+        encoder = msgspec.json.Encoder()
+        async for doc in cursor:
+            yield encoder.encode(EmailOut.from_document(doc)) + b"\n"
+
     @staticmethod
     async def send_email(user_id: str, email_data: EmailCreate) -> EmailResponse:
         """Send a new email"""
         try:
             # Convert string IDs to ObjectIds
             print(0)
-            to_user_ids = []
+            # One query for every recipient instead of one per address
+            found = {user.email: user.id for user in await User.find_by_emails(email_data.to_users).to_list()}
             for email in email_data.to_users:
-                user = await User.find_one(User.email == email)
-                if not user:
+                if email not in found:
                     print(f"User with email {email} not found")
                     raise HTTPException(status_code=404, detail=f"User with email {email} not found")
-                to_user_ids.append(user.id)
+            to_user_ids = [found[email] for email in email_data.to_users]
  
-            # Find or create thread
-            thread = await Thread.find_one({
-                "participants": {"$all": [ObjectId(user_id)] + to_user_ids}
-            })
-            if not thread:
-                # Create new thread
-                thread = Thread(participants=[ObjectId(user_id)] + to_user_ids)
-                thread.lastUpdated = datetime.now(timezone.utc)
-                await thread.insert()
+            # Find or create the thread for this participant set and append
+            # the new email in one atomic upsert; the unique participantsKey
+            # index stops concurrent sends from creating duplicates. The
+            # recipient ids make up the key, so the lookup above can't run
+            # alongside it, but the email id can be allocated up front
+            email_id = ObjectId()
+            participants = [ObjectId(user_id)] + to_user_ids
+            thread_doc = await Thread.get_motor_collection().find_one_and_update(
+                {"participantsKey": Thread.participants_key(participants)},
+                {
+                    "$setOnInsert": {"participants": participants},
+                    "$push": {"emails": email_id},
+                    "$set": {"lastUpdated": datetime.now(timezone.utc)}
+                },
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            thread_id = thread_doc["_id"]
             print(3)
             # Create email
             email = Email(
+                id=email_id,
                 from_user=ObjectId(user_id),
                 to_users=to_user_ids,
                 subject=email_data.subject,
                 body=email_data.body,
-                threadId=thread.id,
+                threadId=thread_id,
                 attachments=email_data.attachments or []
             )
-            await email.insert()
-            # Update thread with new email
-            await thread.update({"$push": {"emails": email.id}, "$set": {"lastUpdated": datetime.now()}})
+            try:
+                await email.insert()
+            except Exception:
+                # Don't leave the thread pointing at an email that was never stored
+                await Thread.get_motor_collection().update_one(
+                    {"_id": thread_id},
+                    {"$pull": {"emails": email_id}}
+                )
+                raise
             return EmailResponse(
                 id=str(email.id),
                 from_user=str(email.from_user),
@@ -601,15 +729,7 @@ class EmailService:
             
             # Connect to SMTP server and send email
             try:
-                if settings.SMTP_USE_TLS:
-                    server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
-                    server.starttls()
-                else:
-                    server = smtplib.SMTP_SSL(settings.SMTP_SERVER, settings.SMTP_PORT)
-                
-                server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-                server.quit()
+                await asyncio.to_thread(_send_via_smtp, msg)
                 
                 # Store email in database after successful sending
                 email_response = await EmailService.send_email(user_id, email_data)
@@ -699,15 +819,7 @@ class EmailService:
             
             # Connect to SMTP server and send email
             try:
-                if settings.SMTP_USE_TLS:
-                    server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
-                    server.starttls()
-                else:
-                    server = smtplib.SMTP_SSL(settings.SMTP_SERVER, settings.SMTP_PORT)
-                
-                server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-                server.quit()
+                await asyncio.to_thread(_send_via_smtp, msg)
                 
                 return {
                     "success": True,
@@ -749,34 +861,27 @@ class EmailService:
     async def mark_email_read(email_id: str, user_id: str) -> EmailResponse:
         """Mark an email as read"""
         try:
-            email = await Email.get(ObjectId(email_id))
-            if not email:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Email not found"
-                )
-            
-            # Verify user has access to this email
-            if ObjectId(user_id) not in email.to_users:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Access denied to this email"
-                )
-            
-            # Mark as read
-            await email.update({"$set": {"isRead": True}})
+            # Access check and update in one round trip; only a miss needs
+            # a second query to tell "not found" from "not a recipient"
+            doc = await Email.get_motor_collection().find_one_and_update(
+                {"_id": ObjectId(email_id), "to": ObjectId(user_id)},
+                {"$set": {"isRead": True}},
+                return_document=ReturnDocument.AFTER
+            )
+            if doc is None:
+                raise await _email_access_error(email_id)
             
             return EmailResponse(
-                id=str(email.id),
-                from_user=str(email.from_user),
-                to_users=[str(to_id) for to_id in email.to_users],
-                subject=email.subject,
-                body=email.body,
-                threadId=str(email.threadId),
-                isRead=True,
-                isDeleted=email.isDeleted,
-                sentAt=email.sentAt,
-                attachments=email.attachments
+                id=str(doc["_id"]),
+                from_user=str(doc["from"]),
+                to_users=list(map(str, doc["to"])),
+                subject=doc["subject"],
+                body=doc["body"],
+                threadId=str(doc["threadId"]),
+                isRead=doc["isRead"],
+                isDeleted=doc.get("isDeleted", False),
+                sentAt=doc["sentAt"],
+                attachments=doc.get("attachments", [])
             )
         except Exception as e:
             raise HTTPException(
@@ -788,22 +893,14 @@ class EmailService:
     async def delete_email(email_id: str, user_id: str) -> bool:
         """Delete an email (soft delete)"""
         try:
-            email = await Email.get(ObjectId(email_id))
-            if not email:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Email not found"
-                )
-            
-            # Verify user has access to this email
-            if ObjectId(user_id) not in email.to_users and ObjectId(user_id) != email.from_user:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Access denied to this email"
-                )
-            
-            # Soft delete
-            await email.update({"$set": {"isDeleted": True}})
+            # Soft delete, limited to the sender and recipients
+            user_oid = ObjectId(user_id)
+            result = await Email.get_motor_collection().update_one(
+                {"_id": ObjectId(email_id), "$or": [{"to": user_oid}, {"from": user_oid}]},
+                {"$set": {"isDeleted": True}}
+            )
+            if result.matched_count == 0:
+                raise await _email_access_error(email_id)
             
             return True
         except Exception as e:
@@ -1,16 +1,23 @@
 import os
-import pickle
-import json
 import re
+import asyncio
+import copy
+import hashlib
+import threading
+import time
+import orjson
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple, Any
 import pytz
+from cachetools import TTLCache
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
 # Google Calendar API
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -23,17 +30,56 @@ from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from fastapi import HTTPException, status
 from bson import ObjectId
 from app.models.meeting import Meeting
-from app.models.user import User
+from app.models.user import User, UserRef
 from app.schemas.meeting import MeetingCreate, MeetingUpdate, MeetingResponse, MeetingListResponse
 from app.config import settings
 
+# Summaries of identical meeting notes, keyed by a hash of the notes
+_SUMMARY_CACHE: TTLCache = TTLCache(maxsize=256, ttl=3600)
+_SUMMARY_CACHE_LOCK = threading.Lock()
+
+# Parsed commands keyed on (normalized command, today's date). Only the Gemini
+# parse is cached; executing the command still happens on every request
+_COMMAND_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+_COMMAND_CACHE_LOCK = threading.Lock()
+
+# Partial-response mask for events.list: only the fields get_events reads,
+# so Google doesn't send conference data, reminders, creator etc.
+_EVENT_LIST_FIELDS = (
+    "items(id,summary,description,start,end,location,attendees(email),"
+    "status,htmlLink,organizer(email),created)"
+)
+
+# English names for slot labels, so formatting doesn't go through the
+# locale-dependent strftime
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_MONTHS = ("January", "February", "March", "April", "May", "June", "July",
+           "August", "September", "October", "November", "December")
+
+def format_clock(dt: datetime) -> str:
+    """Same text as dt.strftime('%I:%M %p') in the C locale"""
+    return f"{dt.hour % 12 or 12:02d}:{dt.minute:02d} {'PM' if dt.hour >= 12 else 'AM'}"
+
+def format_slot_start(dt: datetime) -> str:
+    """Same text as dt.strftime('%A, %B %d at %I:%M %p') in the C locale"""
+    return f"{_WEEKDAYS[dt.weekday()]}, {_MONTHS[dt.month - 1]} {dt.day:02d} at {format_clock(dt)}"
+
+# get_meeting results keyed on (meeting_id, user_id) so access checks still
+# apply per user. Only touched from the event loop, so no lock
+_MEETING_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=30)
+
+def _invalidate_meeting(meeting_id: str) -> None:
+    """Drop every user's cached copy of a meeting"""
+    for key in [key for key in _MEETING_CACHE if key[0] == meeting_id]:
+        _MEETING_CACHE.pop(key, None)
+
 # Google Calendar API scopes
 SCOPES = [
     'https://www.googleapis.com/auth/calendar',
     'https://www.googleapis.com/auth/calendar.events'
 ]
 
-@dataclass
+@dataclass(slots=True)
 class CalendarEvent:
     """Data class for calendar events"""
     id: Optional[str] = None
@@ -63,6 +109,15 @@ class GoogleCalendarManager:
         self.service = None
         self.credentials = None
         self.default_timezone = pytz.timezone(settings.DEFAULT_TIMEZONE)
+        # Calls run on worker threads; each thread gets its own transport
+        self._local = threading.local()
+        
+    def _http(self) -> AuthorizedHttp:
+        """Per-thread authorized transport; httplib2.Http is not thread-safe"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+        return http
         
     def authenticate(self) -> bool:
         """Authenticate with Google Calendar API"""
@@ -83,8 +138,7 @@ class GoogleCalendarManager:
             # Load existing token
             if self.token_file and os.path.exists(self.token_file):
                 try:
-                    with open(self.token_file, 'rb') as token:
-                        creds = pickle.load(token)
+                    creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
                 except Exception as e:
                     print(f"⚠️ Could not load existing token: {e}")
                     creds = None
@@ -112,12 +166,13 @@ class GoogleCalendarManager:
                 # Save credentials for next run
                 if self.token_file:
                     try:
-                        with open(self.token_file, 'wb') as token:
-                            pickle.dump(creds, token)
+                        with open(self.token_file, 'w') as token:
+                            token.write(creds.to_json())
                     except Exception as e:
                         print(f"⚠️ Could not save token: {e}")
             
             self.credentials = creds
+            self._local = threading.local()
             self.service = build('calendar', 'v3', credentials=creds)
             print("✅ Google Calendar API authenticated successfully")
             return True
@@ -163,7 +218,7 @@ class GoogleCalendarManager:
             created_event = self.service.events().insert(
                 calendarId=event.calendar_id, 
                 body=event_body
-            ).execute()
+            ).execute(http=self._http())
             
             print(f"✅ Event created: {created_event['id']}")
             return created_event['id']
@@ -182,7 +237,7 @@ class GoogleCalendarManager:
             event = self.service.events().get(
                 calendarId=calendar_id,
                 eventId=event_id
-            ).execute()
+            ).execute(http=self._http())
             
             # Normalize the event data to match the format from get_events
             if event and isinstance(event, dict):
@@ -263,8 +318,9 @@ class GoogleCalendarManager:
                 timeMax=end_date.isoformat(),
                 maxResults=max_results,
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+                orderBy='startTime',
+                fields=_EVENT_LIST_FIELDS
+            ).execute(http=self._http())
             
             events = events_result.get('items', [])
             
@@ -366,18 +422,9 @@ class SmartScheduler:
             events = self.calendar_manager.get_events(start_date, end_date, calendar_id)
             all_events.extend(events)
         
-                 # Sort events by start time (with safety checks)
-        def safe_get_start_time(event):
-            # Start is already normalized to string in get_events
-            if isinstance(event, dict):
-                return event.get('start', '')
-            return ''
-        
-        all_events.sort(key=safe_get_start_time)
-        
-        free_slots = []
-        current_time = start_date
-        
+        # Parse every event once, then sweep them in true start order
+        # (sorting the raw strings misorders mixed UTC offsets)
+        busy = []
         for event in all_events:
             # Ensure event has valid start and end times
             if not isinstance(event, dict):
@@ -398,33 +445,38 @@ class SmartScheduler:
                 print(f"Warning: Could not parse datetime for event in find_free_slots: {dt_error}")
                 continue
             
-                    # Convert to local timezone if needed
-        if event_start.tzinfo is None:
-            event_start = self.calendar_manager.default_timezone.localize(event_start)
-        if event_end.tzinfo is None:
-            event_end = self.calendar_manager.default_timezone.localize(event_end)
+            # Convert to local timezone if needed
+            if event_start.tzinfo is None:
+                event_start = self.calendar_manager.default_timezone.localize(event_start)
+            if event_end.tzinfo is None:
+                event_end = self.calendar_manager.default_timezone.localize(event_end)
+            busy.append((event_start, event_end))
+        
+        busy.sort()
+        
+        free_slots = []
+        duration = timedelta(minutes=duration_minutes)
+        buffer = timedelta(minutes=self.break_duration)
         
         # Ensure current_time is timezone-aware for comparison
+        current_time = start_date
         if current_time.tzinfo is None:
             current_time = current_time.replace(tzinfo=timezone.utc)
         
-        # Check if there's a free slot before this event
-        if current_time < event_start:
-            slot_duration = (event_start - current_time).total_seconds() / 60
-            if slot_duration >= duration_minutes + self.break_duration:
+        for event_start, event_end in busy:
+            # Check if there's a free slot before this event
+            if event_start - current_time >= duration + buffer:
                 # Check if within working hours
                 if self._is_working_hours(current_time, duration_minutes):
-                    slot_end = current_time + timedelta(minutes=duration_minutes)
-                    free_slots.append((current_time, slot_end))
+                    free_slots.append((current_time, current_time + duration))
+                    if len(free_slots) == 10:
+                        return free_slots
             
-        current_time = max(current_time, event_end + timedelta(minutes=self.break_duration))
+            current_time = max(current_time, event_end + buffer)
         
         # Check for slots after the last event
-        if current_time < end_date:
-            slot_duration = (end_date - current_time).total_seconds() / 60
-            if slot_duration >= duration_minutes and self._is_working_hours(current_time, duration_minutes):
-                slot_end = current_time + timedelta(minutes=duration_minutes)
-                free_slots.append((current_time, slot_end))
+        if end_date - current_time >= duration and self._is_working_hours(current_time, duration_minutes):
+            free_slots.append((current_time, current_time + duration))
         
         return free_slots[:10]  # Return top 10 slots
     
@@ -456,11 +508,9 @@ class SmartScheduler:
             if end_dt.tzinfo is None:
                 end_dt = end_dt.replace(tzinfo=timezone.utc)
             
-            events = self.calendar_manager.get_events(
-                start_dt - timedelta(hours=1),
-                end_dt + timedelta(hours=1),
-                calendar_id
-            )
+            # timeMin/timeMax make the API return only events that overlap
+            # the proposed slot, so no local overlap test is needed
+            events = self.calendar_manager.get_events(start_dt, end_dt, calendar_id)
             
             for existing_event in events:
                 # Ensure existing_event is a dictionary and has valid start/end data
@@ -479,14 +529,18 @@ class SmartScheduler:
                     existing_start = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
                     existing_end = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
                     
-                    # Check for overlap
-                    if (event.start_datetime < existing_end and event.end_datetime > existing_start):
-                        conflicts.append({
-                            'calendar_id': calendar_id,
-                            'conflicting_event': existing_event,
-                            'overlap_start': max(event.start_datetime, existing_start),
-                            'overlap_end': min(event.end_datetime, existing_end)
-                        })
+                    # All-day events come back as bare dates
+                    if existing_start.tzinfo is None:
+                        existing_start = self.calendar_manager.default_timezone.localize(existing_start)
+                    if existing_end.tzinfo is None:
+                        existing_end = self.calendar_manager.default_timezone.localize(existing_end)
+                    
+                    conflicts.append({
+                        'calendar_id': calendar_id,
+                        'conflicting_event': existing_event,
+                        'overlap_start': max(start_dt, existing_start),
+                        'overlap_end': min(end_dt, existing_end)
+                    })
                 except ValueError as dt_error:
                     print(f"Warning: Could not parse datetime for existing_event in detect_conflicts: {dt_error}")
                     continue
@@ -551,6 +605,14 @@ class AICalendarAssistant:
         if not self.model:
             return {}
         
+        # Case, spacing and trailing punctuation don't change the parse;
+        # the date is part of the key so "tomorrow" expires at midnight
+        cache_key = (" ".join(command.lower().split()).rstrip(".!? "), datetime.now().strftime('%Y-%m-%d'))
+        with _COMMAND_CACHE_LOCK:
+            cached = _COMMAND_CACHE.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         prompt = f"""
         Parse the following calendar command and extract structured information:
         Command: "{command}"
@@ -602,7 +664,10 @@ class AICalendarAssistant:
             elif response_text.startswith('```'):
                 response_text = response_text[3:-3].strip()
             
-            parsed_command = json.loads(response_text)
+            parsed_command = orjson.loads(response_text)
+            if parsed_command:
+                with _COMMAND_CACHE_LOCK:
+                    _COMMAND_CACHE[cache_key] = copy.deepcopy(parsed_command)
             return parsed_command
             
         except Exception as e:
@@ -615,6 +680,12 @@ class AICalendarAssistant:
         if not self.model:
             return {"success": False, "message": "Gemini AI not configured"}
         
+        cache_key = hashlib.blake2b(meeting_notes.encode(), digest_size=16).hexdigest()
+        with _SUMMARY_CACHE_LOCK:
+            cached = _SUMMARY_CACHE.get(cache_key)
+        if cached is not None:
+            return {"success": True, "summary_data": copy.deepcopy(cached)}
+        
         prompt = f"""
         Analyze the following meeting notes and provide:
         1. A concise summary
@@ -663,7 +734,9 @@ class AICalendarAssistant:
             elif response_text.startswith('```'):
                 response_text = response_text[3:-3].strip()
             
-            summary_data = json.loads(response_text)
+            summary_data = orjson.loads(response_text)
+            with _SUMMARY_CACHE_LOCK:
+                _SUMMARY_CACHE[cache_key] = copy.deepcopy(summary_data)
             return {
                 "success": True,
                 "summary_data": summary_data
@@ -698,11 +771,10 @@ class MeetingService:
         try:
             # Try to use Google Calendar first
             try:
-                # Initialize calendar manager
-                calendar_manager = GoogleCalendarManager()
-                if calendar_manager.authenticate():
+                calendar_manager = await _shared_calendar_manager()
+                if calendar_manager is not None:
                     # Get user's email from database for calendar lookup
-                    user = await User.get(ObjectId(user_id))
+                    user = await User.find_one(User.id == ObjectId(user_id)).project(UserRef)
                     if not user or not hasattr(user, 'email'):
                         raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
@@ -721,7 +793,8 @@ class MeetingService:
                         end_date = end_date.replace(tzinfo=timezone.utc)
                     
                     # Fetch events from Google Calendar
-                    events = calendar_manager.get_events(
+                    events = await asyncio.to_thread(
+                        calendar_manager.get_events,
                         calendar_id='primary',
                         start_date=start_date,
                         end_date=end_date,
@@ -742,13 +815,9 @@ class MeetingService:
                             continue
                             
                                                  # Check if user is attendee
-                        attendees = event.get('attendees', [])
-                        if attendees:
-                            for attendee in attendees:
-                                # Attendees are already normalized to strings in get_events
-                                if attendee == user.email:
-                                    user_meetings.append(event)
-                                    break
+                        # Attendees are already normalized to strings in get_events
+                        if user.email in event.get('attendees', ()):
+                            user_meetings.append(event)
                     
                                          # Sort by start time (with safety checks)
                     def safe_get_datetime(event):
@@ -844,7 +913,7 @@ class MeetingService:
                             detail=f"Participant with email {participant_input} not found"
                         )
                     participant_emails.append(participant.email)
-                    participant_ids.append(ObjectId(str(participant.id)))
+                    participant_ids.append(participant.id)
                 else:
                     # It's a user ID, validate it's a valid ObjectId
                     try:
@@ -856,7 +925,7 @@ class MeetingService:
                                 detail=f"Participant with ID {participant_input} not found or has no email"
                             )
                         participant_emails.append(participant.email)
-                        participant_ids.append(ObjectId(str(participant.id)))
+                        participant_ids.append(participant.id)
                     except Exception:
                         raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
@@ -894,9 +963,9 @@ class MeetingService:
 
             # Try to use Google Calendar first
             try:
-                calendar_manager = GoogleCalendarManager()
+                calendar_manager = await _shared_calendar_manager()
 
-                if calendar_manager.authenticate():
+                if calendar_manager is not None:
                     calendar_event = CalendarEvent(
                         summary=meeting_data.title,
                         description=meeting_data.description,
@@ -908,9 +977,9 @@ class MeetingService:
 
                     # Conflict detection (if enabled)
                     if getattr(settings, 'ENABLE_CONFLICT_DETECTION', False):
-                        service = MeetingService()
+                        service = await get_meeting_service_async()
                         if service.scheduler:
-                            conflicts = service.scheduler.detect_conflicts(calendar_event)
+                            conflicts = await asyncio.to_thread(service.scheduler.detect_conflicts, calendar_event)
                             if conflicts:
                                 raise HTTPException(
                                     status_code=status.HTTP_409_CONFLICT,
@@ -918,9 +987,9 @@ class MeetingService:
                                 )
 
                                         # Add to Google Calend
-                    event_id = calendar_manager.add_event(calendar_event)
+                    event_id = await asyncio.to_thread(calendar_manager.add_event, calendar_event)
                     if event_id:
-                        created_event = calendar_manager.get_event(event_id, 'primary')
+                        created_event = await asyncio.to_thread(calendar_manager.get_event, event_id, 'primary')
                         if created_event and isinstance(created_event, dict):
                             # Now the event data is already normalized from get_event
                             start_time = created_event.get('start')
@@ -1005,15 +1074,26 @@ class MeetingService:
 
     @staticmethod
     async def get_meeting(meeting_id: str, user_id: str) -> MeetingResponse:
+        """Get meeting details, served from a short-lived cache when possible"""
+        key = (meeting_id, user_id)
+        cached = _MEETING_CACHE.get(key)
+        if cached is None:
+            cached = await MeetingService._get_meeting_uncached(meeting_id, user_id)
+            if cached is None:
+                return None
+            _MEETING_CACHE[key] = cached
+        return cached.model_copy(deep=True)
+
+    @staticmethod
+    async def _get_meeting_uncached(meeting_id: str, user_id: str) -> MeetingResponse:
         """Get meeting details with fallback to database if Google Calendar is not available"""
         try:
             # Try to use Google Calendar first
             try:
-                # Initialize calendar manager
-                calendar_manager = GoogleCalendarManager()
-                if calendar_manager.authenticate():
+                calendar_manager = await _shared_calendar_manager()
+                if calendar_manager is not None:
                     # Get user's email from database for calendar lookup
-                    user = await User.get(ObjectId(user_id))
+                    user = await User.find_one(User.id == ObjectId(user_id)).project(UserRef)
                     if not user or not hasattr(user, 'email'):
                         raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1021,7 +1101,7 @@ class MeetingService:
                         )
                     
                     # Fetch the specific event from Google Calendar
-                    event = calendar_manager.get_event(meeting_id, 'primary')
+                    event = await asyncio.to_thread(calendar_manager.get_event, meeting_id, 'primary')
                     if event and isinstance(event, dict):
                         # Verify user has access to this meeting
                         user_has_access = False
@@ -1071,7 +1151,8 @@ class MeetingService:
                 )
             
             # Verify user has access to this meeting
-            if ObjectId(user_id) != meeting.organizerId and ObjectId(user_id) not in meeting.participants:
+            user_oid = ObjectId(user_id)
+            if user_oid != meeting.organizerId and user_oid not in meeting.participants:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Access denied to this meeting"
@@ -1177,6 +1258,7 @@ class MeetingService:
                     )
             
             await meeting.update({"$set": update_data})
+            _invalidate_meeting(meeting_id)
             
             # Get updated meeting
             updated_meeting = await Meeting.get(ObjectId(meeting_id))
@@ -1217,6 +1299,7 @@ class MeetingService:
             
             # Soft delete by marking as cancelled
             await meeting.update({"$set": {"status": "cancelled"}})
+            _invalidate_meeting(meeting_id)
             
             return True
         except Exception as e:
@@ -1230,7 +1313,7 @@ class MeetingService:
                             start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
         """Find free time slots for a user"""
         try:
-            service = MeetingService()
+            service = await get_meeting_service_async()
             
             if not start_date:
                 start_date = datetime.now(pytz.timezone(settings.DEFAULT_TIMEZONE))
@@ -1243,15 +1326,15 @@ class MeetingService:
             if end_date.tzinfo is None:
                 end_date = end_date.replace(tzinfo=timezone.utc)
             
-            free_slots = service.scheduler.find_free_slots(start_date, end_date, duration_minutes)
+            free_slots = await asyncio.to_thread(service.scheduler.find_free_slots, start_date, end_date, duration_minutes)
             
             formatted_slots = []
             for start, end in free_slots:
                 formatted_slots.append({
                     "start": start.isoformat(),
                     "end": end.isoformat(),
-                    "start_formatted": start.strftime('%A, %B %d at %I:%M %p'),
-                    "end_formatted": end.strftime('%I:%M %p'),
+                    "start_formatted": format_slot_start(start),
+                    "end_formatted": format_clock(end),
                     "duration_minutes": duration_minutes
                 })
             
@@ -1275,7 +1358,7 @@ class MeetingService:
     async def process_natural_language_command(user_id: str, command: str) -> Dict[str, Any]:
         """Process natural language meeting commands"""
         try:
-            service = MeetingService()
+            service = await get_meeting_service_async()
             
             if not service.ai_assistant.model:
                 raise HTTPException(
@@ -1284,7 +1367,7 @@ class MeetingService:
                 )
             
             # Parse the command
-            parsed = service.ai_assistant.parse_natural_language_command(command)
+            parsed = await asyncio.to_thread(service.ai_assistant.parse_natural_language_command, command)
             
             if not parsed:
                 return {"success": False, "message": "Could not understand the command"}
@@ -1312,7 +1395,7 @@ class MeetingService:
     async def summarize_meeting_notes(notes: str) -> Dict[str, Any]:
         """Summarize meeting notes using AI"""
         try:
-            service = MeetingService()
+            service = await get_meeting_service_async()
             
             if not service.ai_assistant.model:
                 raise HTTPException(
@@ -1320,7 +1403,7 @@ class MeetingService:
                     detail="AI assistant not configured. Please set GEMINI_API_KEY."
                 )
             
-            result = service.ai_assistant.summarize_meeting_notes(notes)
+            result = await asyncio.to_thread(service.ai_assistant.summarize_meeting_notes, notes)
             return result
             
         except Exception as e:
@@ -1328,3 +1411,37 @@ class MeetingService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error summarizing notes: {str(e)}"
             )
+
+
+# Process-wide MeetingService. Calendar authentication is retried (at most
+# every _AUTH_RETRY_SECONDS) until it succeeds, so a missing or broken
+# credentials file at first use doesn't disable the calendar until restart
+_meeting_service: Optional[MeetingService] = None
+_meeting_service_lock = threading.Lock()
+_last_auth_attempt = 0.0
+_AUTH_RETRY_SECONDS = 60
+
+def get_meeting_service() -> MeetingService:
+    """Return the shared MeetingService; blocks on Google auth, so async code
+    should use get_meeting_service_async"""
+    global _meeting_service, _last_auth_attempt
+    with _meeting_service_lock:
+        if _meeting_service is None:
+            _last_auth_attempt = time.monotonic()
+            _meeting_service = MeetingService()
+        elif (_meeting_service.calendar_manager.service is None
+              and time.monotonic() - _last_auth_attempt >= _AUTH_RETRY_SECONDS
+              and os.path.exists(settings.GOOGLE_CALENDAR_CREDENTIALS_FILE)):
+            _last_auth_attempt = time.monotonic()
+            _meeting_service.calendar_manager.authenticate()
+        return _meeting_service
+
+async def get_meeting_service_async() -> MeetingService:
+    """get_meeting_service in a worker thread, keeping Google auth off the event loop"""
+    return await asyncio.to_thread(get_meeting_service)
+
+async def _shared_calendar_manager() -> Optional[GoogleCalendarManager]:
+    """The shared service's authenticated calendar manager, or None if Google
+    Calendar isn't available; avoids re-running auth and build() per request"""
+    calendar_manager = (await get_meeting_service_async()).calendar_manager
+    return calendar_manager if calendar_manager.service is not None else None
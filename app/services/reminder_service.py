@@ -45,8 +45,9 @@ class ReminderService:
                     detail="Email not found"
                 )
             
-            # Check if user has access to this email
-            if ObjectId(user_id) not in email.to_users and ObjectId(user_id) != email.from_user:
+            # Check if user has access to this email (sender first: no list scan)
+            user_oid = ObjectId(user_id)
+            if user_oid != email.from_user and user_oid not in email.to_users:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Access denied to this email"
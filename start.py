@@ -3,6 +3,7 @@
 Startup script for Zentar Email Backend API
 """
 
+import sys
 import uvicorn
 from app.config import settings
 
@@ -18,5 +19,7 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
-        log_level="info" if settings.DEBUG else "warning"
+        log_level="info" if settings.DEBUG else "warning",
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools"
     )
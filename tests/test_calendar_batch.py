@@ -0,0 +1,31 @@
+import json
+import unittest
+from datetime import datetime
+
+from app.repositories.chatbot_calender import CalendarEvent, _calendar_service, _event_body
+import msgspec
+
+
+class BatchInsertEncodingTest(unittest.TestCase):
+    def test_non_ascii_event_survives_batch_serialization(self):
+        summary = "Réunion café — 東京"
+        event = CalendarEvent(
+            summary=summary,
+            description="Ordre du jour: café ☕",
+            start_datetime=datetime(2030, 1, 7, 10, 0),
+            end_datetime=datetime(2030, 1, 7, 11, 0),
+            attendees=["zoë@example.com"],
+        )
+        service = _calendar_service()
+        request = service.events().insert(calendarId="primary", body=msgspec.to_builtins(_event_body(event)))
+        serialized = service.new_batch_http_request()._serialize_request(request)
+
+        headers, _, payload = serialized.partition("\n\n")
+        body = json.loads(payload)
+        self.assertEqual(body["summary"], summary)
+        self.assertEqual(body["attendees"], [{"email": "zoë@example.com"}])
+        self.assertIn(f"content-length: {len(payload)}", headers.lower())
+
+
+if __name__ == "__main__":
+    unittest.main()